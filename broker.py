@@ -1,7 +1,6 @@
 import time
-import json
+import orjson
 import os
-from datetime import datetime
 import numpy as np
 import pyaudio
 import aubio
@@ -98,8 +97,8 @@ def connect_mqtt():
 def publish_data(data):
     """Publish data to MQTT topic"""
     try:
-        msg = json.dumps(data)
-        result = client.publish(MQTT_TOPIC, msg)
+        msg = orjson.dumps(data)
+        result = client.publish(MQTT_TOPIC, msg, qos=0)
         status = result[0]
         if status == 0:
             return True
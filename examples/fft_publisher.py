@@ -1,13 +1,15 @@
 import time
-import json
 import os
+import zlib
+import orjson
+import threading
+from collections import deque
 import paho.mqtt.client as mqtt
-from datetime import datetime
 import numpy as np
 import pyaudio
 import aubio
 from rich.console import Console
-import scipy.fftpack
+import scipy.fft
 
 # Audio parameters
 BUFFER_SIZE = 512
@@ -31,6 +33,32 @@ FREQ_BANDS = [
     (5000, 8000),  # Ultra high (5-8kHz)
 ]
 
+# FFT bins are uniformly spaced, so each band maps to a constant slice of bins
+FREQ_RESOLUTION = SAMPLE_RATE / BUFFER_SIZE
+
+
+def band_slice(low_freq, high_freq):
+    """Slice of FFT bins whose frequencies fall within [low_freq, high_freq]"""
+    return slice(
+        int(np.ceil(low_freq / FREQ_RESOLUTION)),
+        int(np.floor(high_freq / FREQ_RESOLUTION)) + 1,
+    )
+
+
+BAND_SLICES = [band_slice(low_freq, high_freq) for low_freq, high_freq in FREQ_BANDS]
+
+# The bands are contiguous, so their bins are delimited by a single edge list
+# and all band sums come from one np.add.reduceat pass
+BAND_EDGES = np.array(
+    [bins.start for bins in BAND_SLICES] + [BAND_SLICES[-1].stop], dtype=np.intp
+)
+BAND_BIN_COUNTS = np.diff(BAND_EDGES).astype(np.float32)
+
+# Per-band weights applied to the band sums: the mean over the band's bins,
+# with the bass (80-250Hz) reduced by 50%
+BAND_WEIGHTS = 1.0 / BAND_BIN_COUNTS
+BAND_WEIGHTS[0] *= 0.5
+
 # Set up Rich console
 console = Console()
 
@@ -46,6 +74,25 @@ for i in range(p.get_device_count()):
     device_info = p.get_device_info_by_index(i)
     console.print(f"Device {i}: {device_info['name']}")
 
+# Ring buffer of captured audio frames. The PyAudio callback is the only writer
+# of ring_head and the main loop the only reader, so no lock is needed
+RING_FRAMES = 32
+audio_ring = np.empty((RING_FRAMES, BUFFER_SIZE), dtype=np.float32)
+ring_head = 0  # Total number of frames written by the callback
+audio_ready = threading.Event()
+
+
+def on_audio(in_data, frame_count, time_info, status):
+    """PyAudio callback: copy the new frame into the ring buffer"""
+    global ring_head
+    audio_ring[ring_head % RING_FRAMES] = np.frombuffer(
+        in_data, dtype=np.float32, count=BUFFER_SIZE
+    )
+    ring_head += 1
+    audio_ready.set()
+    return (None, pyaudio.paContinue)
+
+
 # Open input stream from microphone
 stream = p.open(
     format=pyaudio.paFloat32,
@@ -53,10 +100,25 @@ stream = p.open(
     rate=SAMPLE_RATE,
     input=True,
     frames_per_buffer=BUFFER_SIZE,
+    stream_callback=on_audio,
 )
 
 # Initialize onset detectors (keeping these for beat detection alongside FFT)
-ONSET_METHODS = ["energy", "hfc", "complex", "phase", "specflux"]
+# "energy", "hfc" and "specflux" are computed from our own FFT (see
+# detect_spectral_onset), so aubio only runs the methods that need its
+# internal phase history
+ONSET_METHODS = ["complex", "phase"]
+SPECTRAL_ONSET_METHODS = ["energy", "hfc", "specflux"]
+
+# Kick and hi-hat onsets use the spectral flux restricted to these bands
+PERCUSSION_BANDS = {
+    "kick": (80, 250),  # Bass
+    "hihat": (4000, 8000),  # High/Ultra high
+}
+PERCUSSION_SLICES = {
+    name: band_slice(low_freq, high_freq)
+    for name, (low_freq, high_freq) in PERCUSSION_BANDS.items()
+}
 
 onset_detectors = {}
 for method in ONSET_METHODS:
@@ -66,6 +128,30 @@ for method in ONSET_METHODS:
     detector.set_minioi_ms(100)  # Larger minimum interval between onsets (100ms)
     onset_detectors[method] = detector
 
+# The peak-picking thresholds are fixed above, so read them back only once
+onset_thresholds = {
+    method: float(detector.get_threshold())
+    for method, detector in onset_detectors.items()
+}
+
+# Peak picking for the spectral onset methods, matching the aubio settings above
+ONSET_THRESHOLD = 0.5
+ONSET_SILENCE_LEVEL = 10 ** (-50 / 20)  # -50 dB as a linear RMS level
+ONSET_MIN_INTERVAL = 0.1  # seconds
+ONSET_HISTORY = 10  # frames of descriptor history for the adaptive threshold
+
+onset_history = {
+    method: deque(maxlen=ONSET_HISTORY)
+    for method in SPECTRAL_ONSET_METHODS + list(PERCUSSION_BANDS)
+}
+last_onset_time = {method: 0.0 for method in onset_history}
+
+# Bin index weights for the high frequency content descriptor
+hfc_weights = np.arange(BUFFER_SIZE // 2 + 1, dtype=np.float32)
+
+# Previous frame's magnitude spectrum, for the spectral flux descriptors
+prev_magnitude = np.zeros(BUFFER_SIZE // 2 + 1, dtype=np.float32)
+
 # Initialize tempo detection
 tempo_detector = aubio.tempo("specdiff", BUFFER_SIZE, BUFFER_SIZE, SAMPLE_RATE)
 tempo_detector.set_threshold(0.5)  # Higher threshold for tempo detection
@@ -76,7 +162,9 @@ note_detector.set_silence(-30)  # Less sensitive to quiet notes
 note_detector.set_minioi_ms(100)  # Larger minimum interval between notes
 
 # Smoothing for frequency band energies
-smoothed_band_energy = np.zeros(len(FREQ_BANDS))  # Now 7 bands after combining 1k-3k
+# Now 7 bands after combining 1k-3k. The whole spectrum pipeline stays in
+# float32 to match the paFloat32 input
+smoothed_band_energy = np.zeros(len(FREQ_BANDS), dtype=np.float32)
 smoothing_factor = 0.2  # Higher = more smoothing, must be < 1.0
 
 # Volume-based gain adjustment
@@ -86,6 +174,8 @@ GAIN_THRESHOLD = 0.03  # Base threshold for gain adjustment
 MAX_GAIN = 0.8  # Maximum gain to prevent pegging at 1.0
 MIN_GAIN = 0.2  # Minimum gain level
 gain_multiplier = 0.5  # Start with a moderate gain
+GAIN_SCALE = 0.5 * (MAX_GAIN - MIN_GAIN)  # Target gain per threshold of volume
+GAIN_MAX_STEP = 0.01  # Maximum gain change per frame
 
 
 def connect_mqtt():
@@ -105,7 +195,8 @@ def connect_mqtt():
 def publish_data(data):
     """Publish data to MQTT topic"""
     try:
-        msg = json.dumps(data)
+        # zlib level 1 shrinks the JSON several times over for little CPU
+        msg = zlib.compress(orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY), 1)
         result = client.publish(MQTT_TOPIC, msg)
         status = result[0]
         if status == 0:
@@ -120,55 +211,47 @@ def publish_data(data):
         return False
 
 
-def calculate_band_energy(fft_data, freqs):
+def detect_spectral_onset(method, descriptor, volume, current_time):
+    """Peak-pick an onset from a descriptor computed from the shared spectrum"""
+    history = onset_history[method]
+    if history:
+        # Adaptive threshold above the recent median, like aubio's peak picker
+        threshold = float(np.median(history) + ONSET_THRESHOLD * np.mean(history))
+    else:
+        threshold = descriptor
+    history.append(descriptor)
+
+    is_beat = (
+        descriptor > threshold
+        and volume > ONSET_SILENCE_LEVEL
+        and current_time - last_onset_time[method] >= ONSET_MIN_INTERVAL
+    )
+    if is_beat:
+        last_onset_time[method] = current_time
+
+    return is_beat, threshold
+
+
+def calculate_band_energy(magnitude):
     """Calculate energy in each frequency band with adaptive scaling and bass attenuation"""
-    band_energy = []
-    # Calculate raw energies first to determine adaptive scaling
-    raw_energies = []
-
-    for low_freq, high_freq in FREQ_BANDS:
-        # Find indices corresponding to this frequency band
-        indices = np.where((freqs >= low_freq) & (freqs <= high_freq))[0]
-
-        if len(indices) > 0:
-            # Calculate average energy in this band
-            energy = np.mean(np.abs(fft_data[indices]))
-            raw_energies.append(energy)
-        else:
-            raw_energies.append(0.0)
+    # Average energy in each band. reduceat's last element sums the bins above
+    # the top band and is dropped
+    band_sums = np.add.reduceat(magnitude, BAND_EDGES)[:-1]
 
-    # Attenuate bass before calculating max energy for better balance
-    # First band is bass (80-250Hz) - attenuate it
-    if len(raw_energies) > 0:
-        # Store original bass energy
-        original_bass = raw_energies[0]
-        # Apply attenuation to bass for max energy calculation
-        raw_energies[0] *= 0.5  # Reduce bass by 50%
+    # Attenuate bass before calculating max energy for better balance; the
+    # attenuation also carries through to the final bass value
+    raw_energies = band_sums * BAND_WEIGHTS
 
     # Calculate adaptive scaling factor based on maximum energy
-    max_energy = max(raw_energies) if raw_energies else 0
+    max_energy = float(raw_energies.max())
     if max_energy > 0:
         # Scale so that the max value will be around 0.7-0.8 but not saturate
         adaptive_scale = 0.8 / max_energy
     else:
         adaptive_scale = 1.0
 
-    # Restore original bass energy before final scaling
-    if len(raw_energies) > 0:
-        raw_energies[0] = original_bass
-
-    # Apply the adaptive scaling to all bands
-    for i, energy in enumerate(raw_energies):
-        # Apply extra attenuation to bass (80-250Hz)
-        if i == 0:
-            # Apply scaling and bass attenuation but ensure we don't exceed 1.0
-            scaled_energy = min(1.0, energy * adaptive_scale * 0.5)
-        else:
-            # Apply normal scaling for other bands
-            scaled_energy = min(1.0, energy * adaptive_scale)
-        band_energy.append(float(scaled_energy))
-
-    return band_energy
+    # Apply the adaptive scaling to all bands but ensure we don't exceed 1.0
+    return np.minimum(raw_energies * adaptive_scale, 1.0)
 
 
 # Main processing loop
@@ -183,7 +266,10 @@ if not connect_mqtt():
     exit(1)
 
 # Apply a window function to reduce spectral leakage
-hann_window = np.hanning(BUFFER_SIZE)
+hann_window = np.hanning(BUFFER_SIZE).astype(np.float32)
+
+# Total number of frames consumed by the main loop
+ring_tail = 0
 
 # Track publish rate
 publish_count = 0
@@ -191,155 +277,164 @@ last_report_time = time.time()
 
 try:
     while True:
-        # Read audio data
-        audiobuffer = stream.read(BUFFER_SIZE, exception_on_overflow=False)
-        signal = np.frombuffer(audiobuffer, dtype=np.float32)
-
-        # Calculate volume for gain adjustment
-        volume = float(np.sqrt(np.mean(signal**2)))
-
-        # Update volume history
-        volume_history.append(volume)
-        if len(volume_history) > MAX_VOLUME_HISTORY:
-            volume_history.pop(0)
-
-        # Calculate average volume over the last ~1 second
-        avg_volume = sum(volume_history) / len(volume_history)
-
-        # Dynamically adjust gain multiplier based on average volume
-        # Lower volume = lower gain multiplier (makes display less active)
-        # Higher volume = higher gain multiplier (makes display more responsive)
-        if avg_volume < GAIN_THRESHOLD:
-            # Calculate a gain that scales with volume (approaches MIN_GAIN at very low volumes)
-            target_gain = MIN_GAIN + (avg_volume / GAIN_THRESHOLD) * (
-                MAX_GAIN - MIN_GAIN
-            )
-            # Apply a faster reduction rate when volume is very low
-            reduction_factor = 0.80 if avg_volume < (GAIN_THRESHOLD * 0.5) else 0.95
-            # Smooth transition to avoid sudden changes
-            gain_multiplier = (
-                reduction_factor * gain_multiplier
-                + (1 - reduction_factor) * target_gain
+        # Wait for the callback, then drain every frame captured since
+        audio_ready.wait()
+        audio_ready.clear()
+        head = ring_head
+        if head - ring_tail > RING_FRAMES:
+            # We fell behind by a whole ring; skip the overwritten frames
+            console.print(
+                f"[bold yellow]Dropped {head - ring_tail - RING_FRAMES} audio frames[/bold yellow]"
             )
-        else:
-            # For normal/loud volumes, gradually approach MAX_GAIN
-            # but at a slower rate to prevent rapid jumps
-            old_gain = gain_multiplier
-
-            # Calculate how close to MAX_GAIN we want to be based on volume
-            volume_factor = min(
-                1.0, (avg_volume - GAIN_THRESHOLD) / (GAIN_THRESHOLD * 2)
+            ring_tail = head - RING_FRAMES
+
+        while ring_tail < head:
+            # Analyze the frame in place; the callback won't reach this slot
+            # again until RING_FRAMES more frames arrive
+            signal = audio_ring[ring_tail % RING_FRAMES]
+            ring_tail += 1
+
+            # Calculate volume (RMS) once per frame, used for gain adjustment and
+            # the published packet. np.dot gives the sum of squares in one pass.
+            volume = float(np.sqrt(np.dot(signal, signal) / BUFFER_SIZE))
+
+            # Update volume history
+            volume_history.append(volume)
+            if len(volume_history) > MAX_VOLUME_HISTORY:
+                volume_history.pop(0)
+
+            # Calculate average volume over the last ~1 second
+            avg_volume = sum(volume_history) / len(volume_history)
+
+            # Dynamically adjust gain multiplier based on average volume
+            # Lower volume = lower gain multiplier (makes display less active)
+            # Higher volume = higher gain multiplier (makes display more responsive)
+            # The target reaches MAX_GAIN at twice the threshold volume, and the gain
+            # moves toward it by at most GAIN_MAX_STEP per frame
+            target_gain = MIN_GAIN + min(avg_volume / GAIN_THRESHOLD, 2.0) * GAIN_SCALE
+            gain_step = max(
+                -GAIN_MAX_STEP, min(GAIN_MAX_STEP, target_gain - gain_multiplier)
             )
-            target_gain = MIN_GAIN + (MAX_GAIN - MIN_GAIN) * (0.5 + volume_factor * 0.5)
-
-            # Limit the maximum change per cycle
-            max_change = 0.01
-            if target_gain > old_gain:
-                new_gain = min(target_gain, old_gain + max_change)
-            else:
-                new_gain = max(target_gain, old_gain - max_change)
-
-            # Ensure gain stays within limits
-            gain_multiplier = max(MIN_GAIN, min(MAX_GAIN, new_gain))
+            gain_multiplier = max(MIN_GAIN, min(MAX_GAIN, gain_multiplier + gain_step))
 
-        # Apply window function to the signal
-        windowed_signal = signal * hann_window
+            # Apply window function to the signal
+            windowed_signal = signal * hann_window
 
-        # Perform FFT
-        fft_data = scipy.fftpack.fft(windowed_signal)
+            # Perform FFT. The real-input transform returns only the positive half
+            # of the spectrum (bins 0 through Nyquist)
+            fft_data = scipy.fft.rfft(windowed_signal)
 
-        # Calculate frequency bins
-        freqs = scipy.fftpack.fftfreq(len(fft_data), 1.0 / SAMPLE_RATE)
+            # Magnitude spectrum shared by the band energies and onset descriptors
+            magnitude = np.abs(fft_data)
 
-        # We only need the positive half of the spectrum (due to symmetry)
-        positive_freq_indices = np.where(freqs >= 0)[0]
-        freqs = freqs[positive_freq_indices]
-        fft_data = fft_data[positive_freq_indices]
+            # Positive spectral change since the previous frame
+            flux = np.maximum(magnitude - prev_magnitude, 0)
+            prev_magnitude = magnitude
 
-        # Calculate energy in each frequency band
-        band_energy = calculate_band_energy(fft_data, freqs)
+            # Calculate energy in each frequency band
+            band_energy = calculate_band_energy(magnitude)
 
-        # We no longer apply gain multiplier to the actual data
-        # Gain multiplier is now only used to control visualization state
+            # We no longer apply gain multiplier to the actual data
+            # Gain multiplier is now only used to control visualization state
 
-        # Apply smoothing to band energy
-        smoothed_band_energy = smoothing_factor * smoothed_band_energy + (
-            1 - smoothing_factor
-        ) * np.array(band_energy)
-
-        # Process the audio data
-        timestamp = datetime.now().isoformat()
-
-        # Detect onsets with all methods (keeping for beat detection)
-        onset_data = {}
-        for method, detector in onset_detectors.items():
-            is_beat = bool(detector(signal))
-            descriptor = float(detector.get_descriptor())
-            threshold = float(detector.get_threshold())
+            # Apply smoothing to band energy
+            smoothed_band_energy = (
+                smoothing_factor * smoothed_band_energy
+                + (1 - smoothing_factor) * band_energy
+            )
 
-            # No longer applying gain multiplier to descriptors
-            # Let visualizer handle display control based on gain
+            # Process the audio data. The frame time doubles as the packet
+            # timestamp; subscribers format it for display themselves
+            current_time = time.time()
 
-            onset_data[method] = {
-                "is_beat": is_beat,
-                "descriptor": descriptor,  # Using unadjusted descriptor
-                "threshold": threshold,
+            # Energy, HFC and spectral flux onsets come straight from the spectrum
+            spectral_descriptors = {
+                "energy": volume,
+                "hfc": float(np.dot(hfc_weights, magnitude)),
+                "specflux": float(flux.sum()),
             }
+            onset_data = {}
+            for method, descriptor in spectral_descriptors.items():
+                is_beat, threshold = detect_spectral_onset(
+                    method, descriptor, volume, current_time
+                )
+                onset_data[method] = {
+                    "is_beat": is_beat,
+                    "descriptor": descriptor,
+                    "threshold": threshold,
+                }
+
+            # Detect onsets with the remaining aubio methods
+            for method, detector in onset_detectors.items():
+                is_beat = bool(detector(signal))
+                descriptor = float(detector.get_descriptor())
+
+                # No longer applying gain multiplier to descriptors
+                # Let visualizer handle display control based on gain
+
+                onset_data[method] = {
+                    "is_beat": is_beat,
+                    "descriptor": descriptor,  # Using unadjusted descriptor
+                    "threshold": onset_thresholds[method],
+                }
+
+            # Check tempo detector
+            is_tempo_beat = bool(tempo_detector(signal))
+            bpm = float(tempo_detector.get_bpm())
+
+            # Detect notes
+            note_array = note_detector(signal)
+            has_note = bool(note_array.size > 0 and note_array[0] > 0)
+
+            # Detect kick drum and hi-hat from the spectral flux in their bands
+            percussion_onsets = {}
+            for name, bins in PERCUSSION_SLICES.items():
+                band_flux = float(flux[bins].sum())
+                percussion_onsets[name], _ = detect_spectral_onset(
+                    name, band_flux, volume, current_time
+                )
+
+            # Kick needs a bass flux onset while the bass band is active
+            kick_detected = bool(
+                percussion_onsets["kick"]
+                and smoothed_band_energy[0]
+                > 0.4  # Lower threshold due to bass attenuation
+            )
 
-        # Check tempo detector
-        is_tempo_beat = bool(tempo_detector(signal))
-        bpm = float(tempo_detector.get_bpm())
-
-        # Detect notes
-        note_array = note_detector(signal)
-        has_note = bool(note_array.size > 0 and note_array[0] > 0)
-
-        # Calculate volume
-        volume = float(np.sqrt(np.mean(signal**2)))
-
-        # Detect kick drum (using energy detector and bass band)
-        kick_detected = bool(
-            onset_data.get("energy", {}).get("is_beat", False)
-            and smoothed_band_energy[0] > 0.4  # Lower threshold due to bass attenuation
-        )
+            # Hi-hat needs a high-band flux onset while the 4-5kHz band is active
+            hihat_detected = bool(
+                smoothed_band_energy[5] > 0.7  # High band (4-5kHz)
+                and percussion_onsets["hihat"]
+            )
 
-        # Detect hi-hat (using the 4-8kHz ultra high frequency band)
-        hihat_detected = bool(
-            smoothed_band_energy[5] > 0.7  # Ultra high band (4-8kHz)
-            and onset_data.get("hfc", {}).get("is_beat", False)
-        )
+            # Create data packet
+            data_packet = {
+                "timestamp": current_time,
+                "onsets": onset_data,
+                "tempo": {"is_beat": is_tempo_beat, "bpm": bpm},
+                "note_detected": has_note,
+                "volume": volume,
+                "avg_volume": avg_volume,
+                "gain_multiplier": gain_multiplier,
+                "kick_detected": kick_detected,
+                "hihat_detected": hihat_detected,
+                "spectrum": {
+                    "band_energy": smoothed_band_energy.tolist(),
+                    "band_ranges": FREQ_BANDS,
+                },
+            }
 
-        # Create data packet
-        data_packet = {
-            "timestamp": timestamp,
-            "onsets": onset_data,
-            "tempo": {"is_beat": is_tempo_beat, "bpm": bpm},
-            "note_detected": has_note,
-            "volume": volume,
-            "avg_volume": avg_volume,
-            "gain_multiplier": gain_multiplier,
-            "kick_detected": kick_detected,
-            "hihat_detected": hihat_detected,
-            "spectrum": {
-                "band_energy": [float(e) for e in smoothed_band_energy],
-                "band_ranges": FREQ_BANDS,
-            },
-        }
-
-        # Publish to MQTT
-        publish_data(data_packet)
-        publish_count += 1
-
-        # Log publish rate every 5 seconds
-        current_time = time.time()
-        if current_time - last_report_time >= 5:
-            rate = publish_count / (current_time - last_report_time)
-            console.print(f"Publishing rate: {rate:.2f} messages/second")
-            publish_count = 0
-            last_report_time = current_time
-
-        # Small delay to reduce CPU usage
-        time.sleep(0.01)
+            # Publish to MQTT
+            publish_data(data_packet)
+            publish_count += 1
+
+            # Log publish rate every 5 seconds
+            current_time = time.time()
+            if current_time - last_report_time >= 5:
+                rate = publish_count / (current_time - last_report_time)
+                console.print(f"Publishing rate: {rate:.2f} messages/second")
+                publish_count = 0
+                last_report_time = current_time
 
 except KeyboardInterrupt:
     console.print("[bold red]Stopping...[/bold red]")
@@ -39,18 +39,11 @@ center_idx = sample_idx - start_idx
 start_frame = max(0, center_idx - frame_length // 2)
 end_frame = min(len(segment), start_frame + frame_length)
 
-# If we don't have enough samples, pad with zeros
-if end_frame - start_frame < frame_length:
-    frame_data = np.zeros(frame_length)
-    frame_data[: end_frame - start_frame] = segment[start_frame:end_frame]
-else:
-    frame_data = segment[start_frame:end_frame]
-
 # Apply window function
-frame_data = frame_data * window
+frame_data = segment[start_frame:end_frame] * window[: end_frame - start_frame]
 
-# Compute the FFT
-fft_data = np.abs(np.fft.rfft(frame_data))
+# Compute the FFT. If we don't have enough samples, rfft pads with zeros
+fft_data = np.abs(np.fft.rfft(frame_data, n=frame_length))
 fft_freq = np.fft.rfftfreq(frame_length, 1 / sr)
 
 # Detect peaks in the spectrum
@@ -1,5 +1,6 @@
 import json
 import time
+import threading
 from datetime import datetime
 import paho.mqtt.client as mqtt
 from rich.console import Console
@@ -26,6 +27,8 @@ METHOD_DESCRIPTIONS = {
 
 # Initialize data storage for display
 latest_data = None
+# Set whenever a new message arrives, so the display only redraws on new data
+data_event = threading.Event()
 
 
 def on_connect(client, userdata, flags, rc):
@@ -45,26 +48,57 @@ def on_message(client, userdata, msg):
     global latest_data
     try:
         latest_data = json.loads(msg.payload.decode())
+        data_event.set()
     except Exception as e:
         console.print(f"[bold red]Error parsing message: {e}[/bold red]")
 
 
-def create_display_table(data):
-    """Create a table for displaying the latest music detection data"""
-    if not data:
-        table = Table(title="Waiting for music detection data...")
-        return table
+# Frequency ranges for the note block display
+FREQ_RANGES = [
+    (20, 80),  # Sub-bass
+    (80, 250),  # Bass
+    (250, 500),  # Low-mids
+    (500, 1000),  # Mids
+    (1000, 2000),  # Upper-mids
+    (2000, 3000),  # Presence
+    (3000, 4000),  # Brilliance
+    (4000, 8000),  # Air/Ultra high
+]
 
-    table = Table(title=f"Music Detection Data - {data['timestamp']}")
+# Fixed row positions in the display table
+METHOD_ROWS = {method: i for i, method in enumerate(METHOD_DESCRIPTIONS)}
+FREQ_BANDS_ROW = len(METHOD_ROWS)
+KICK_ROW = FREQ_BANDS_ROW + 1
+HIHAT_ROW = FREQ_BANDS_ROW + 2
+BPM_ROW = FREQ_BANDS_ROW + 3
+
+
+def create_display_table():
+    """Create the display table once, with a row for every feature"""
+    table = Table(title="Waiting for music detection data...")
 
     table.add_column("Feature", style="cyan")
     table.add_column("Value", style="green", width=15, justify="right")
 
+    for method_desc in METHOD_DESCRIPTIONS.values():
+        table.add_row(f"{method_desc:<15}", "")
+    for label in ("Freq Bands", "Kick", "Hi-Hat", "BPM"):
+        table.add_row(label.ljust(15), "")
+
+    return table
+
+
+def update_display_table(table, data):
+    """Update the table cells in place with the latest music detection data"""
+    table.title = f"Music Detection Data - {data['timestamp']}"
+    features = table.columns[0]._cells
+    values = table.columns[1]._cells
+
     # Beat detection from all methods
     for method, method_desc in METHOD_DESCRIPTIONS.items():
+        row = METHOD_ROWS[method]
         if method in data["onsets"]:
-            onset_data = data["onsets"][method]
-            is_beat = onset_data["is_beat"]
+            is_beat = data["onsets"][method]["is_beat"]
             beat_display = (
                 "[bold green]YES[/bold green]" if is_beat else "[dim]no[/dim]"
             )
@@ -72,31 +106,20 @@ def create_display_table(data):
             # Use color coding based on beat detection
             method_color = "green" if is_beat else "cyan"
 
-            table.add_row(
-                f"[{method_color}]{method_desc:<15}[/{method_color}]",
-                f"{beat_display:>15}",
-            )
+            features[row] = f"[{method_color}]{method_desc:<15}[/{method_color}]"
+            values[row] = f"{beat_display:>15}"
+        else:
+            features[row] = f"{method_desc:<15}"
+            values[row] = ""
 
     # Frequency visualization
     pitch = data["pitch"]["value"]
     pitch_confidence = data["pitch"]["confidence"]
     note_detected = data["note_detected"]
 
-    # Create frequency band visualization
-    freq_ranges = [
-        (20, 80),  # Sub-bass
-        (80, 250),  # Bass
-        (250, 500),  # Low-mids
-        (500, 1000),  # Mids
-        (1000, 2000),  # Upper-mids
-        (2000, 3000),  # Presence
-        (3000, 4000),  # Brilliance
-        (4000, 8000),  # Air/Ultra high
-    ]
-
     note_blocks = ""
     highlight_note = note_detected and pitch_confidence > 0.4
-    for i, (min_freq, max_freq) in enumerate(freq_ranges):
+    for min_freq, max_freq in FREQ_RANGES:
         if min_freq <= pitch < max_freq:
             if highlight_note:
                 note_blocks += "■ "  # Filled block
@@ -105,30 +128,26 @@ def create_display_table(data):
         else:
             note_blocks += "□ "  # Empty block
 
-    table.add_row("Freq Bands".ljust(15), f"[blue]{note_blocks}[/blue]".rjust(15))
+    values[FREQ_BANDS_ROW] = f"[blue]{note_blocks}[/blue]".rjust(15)
 
     # Kick drum detection
-    kick_detected = data["kick_detected"]
-    if kick_detected:
+    if data["kick_detected"]:
         kick_indicator = "[bold red]⚫ KICK ⚫[/bold red]"
     else:
         kick_indicator = "[dim]----------[/dim]"
-    table.add_row("Kick".ljust(15), f"{kick_indicator}".rjust(15))
+    values[KICK_ROW] = f"{kick_indicator}".rjust(15)
 
     # Hi-hat detection
-    hihat_detected = data["hihat_detected"]
-    if hihat_detected:
+    if data["hihat_detected"]:
         hihat_indicator = f"[bold yellow]✧✧ +++ ✧✧[/bold yellow]"
     else:
         hihat_indicator = "[dim]----------[/dim]"
-    table.add_row("Hi-Hat".ljust(15), f"{hihat_indicator}".rjust(15))
+    values[HIHAT_ROW] = f"{hihat_indicator}".rjust(15)
 
     # BPM from tempo estimation
     bpm = data["tempo"]["bpm"]
     bpm_color = "green" if bpm > 10 else "dim"
-    table.add_row("BPM".ljust(15), f"[{bpm_color}]{bpm:6.1f}[/{bpm_color}]".rjust(15))
-
-    return table
+    values[BPM_ROW] = f"[{bpm_color}]{bpm:6.1f}[/{bpm_color}]".rjust(15)
 
 
 def main():
@@ -155,11 +174,15 @@ def main():
 
     # Use Rich's Live display for real-time updates
     try:
-        with Live(refresh_per_second=10) as live:
+        table = create_display_table()
+        # Live re-renders the table 10 times a second; the loop only rewrites
+        # its cells when a message arrives
+        with Live(table, refresh_per_second=10):
             while True:
-                table = create_display_table(latest_data)
-                live.update(table)
-                time.sleep(0.1)
+                # Sleep until a message arrives; the timeout keeps Ctrl+C responsive
+                if data_event.wait(timeout=0.5):
+                    data_event.clear()
+                    update_display_table(table, latest_data)
     except KeyboardInterrupt:
         console.print("[bold red]Stopping...[/bold red]")
     finally:
@@ -1,17 +1,19 @@
-import time
 import sys
+import os
+import threading
 from datetime import datetime
-from collections import deque
 import numpy as np
 import pyaudio
 import aubio
 from rich.console import Console
 from rich.live import Live
 from rich.table import Table
+from rich.text import Text
 from rich.prompt import Prompt
 
 # Audio parameters
-BUFFER_SIZE = 512  # Changed to match what aubio onset expects
+BUFFER_SIZE = 1024  # Analysis window; aubio keeps the overlap between hops
+HOP_SIZE = 512  # Samples per captured frame
 SAMPLE_RATE = 44100
 CHANNELS = 1
 
@@ -27,6 +29,25 @@ for i in range(p.get_device_count()):
     device_info = p.get_device_info_by_index(i)
     print(f"Device {i}: {device_info['name']}")
 
+# Ring buffer of captured audio frames. The PyAudio callback is the only writer
+# of ring_head and the main loop the only reader, so no lock is needed
+RING_FRAMES = 32
+audio_ring = np.empty((RING_FRAMES, HOP_SIZE), dtype=np.float32)
+ring_head = 0  # Total number of frames written by the callback
+audio_ready = threading.Event()
+
+
+def on_audio(in_data, frame_count, time_info, status):
+    """PyAudio callback: copy the new frame into the ring buffer"""
+    global ring_head
+    audio_ring[ring_head % RING_FRAMES] = np.frombuffer(
+        in_data, dtype=np.float32, count=HOP_SIZE
+    )
+    ring_head += 1
+    audio_ready.set()
+    return (None, pyaudio.paContinue)
+
+
 # Open input stream from USB microphone
 # You may need to specify the device_index based on the output above
 stream = p.open(
@@ -34,12 +55,18 @@ stream = p.open(
     channels=CHANNELS,
     rate=SAMPLE_RATE,
     input=True,
-    frames_per_buffer=BUFFER_SIZE,
+    frames_per_buffer=HOP_SIZE,
+    stream_callback=on_audio,
 )
 
-# Initialize multiple onset detectors with different methods
+# Initialize onset detectors with the configured methods
 # Available onset detection methods: energy, hfc, complex, phase, wphase, mkl, kl, specflux
-ONSET_METHODS = ["energy", "hfc", "complex", "phase", "specflux"]
+# Each method runs its own analysis on every frame, so only "energy" (which also
+# drives the kick indicator) runs by default. Set ONSET_METHODS to a
+# comma-separated list, e.g. "energy,hfc,complex,phase,specflux", to compare them
+ONSET_METHODS = [
+    m.strip() for m in os.environ.get("ONSET_METHODS", "energy").split(",") if m.strip()
+]
 
 # Method descriptions
 METHOD_DESCRIPTIONS = {
@@ -57,108 +84,137 @@ METHOD_DESCRIPTIONS = {
 onset_detectors = {}
 
 for method in ONSET_METHODS:
-    detector = aubio.onset(method, BUFFER_SIZE, BUFFER_SIZE, SAMPLE_RATE)
+    detector = aubio.onset(method, BUFFER_SIZE, HOP_SIZE, SAMPLE_RATE)
     detector.set_threshold(0.1)  # Lower threshold for more sensitivity
     detector.set_silence(-70)  # Even lower silence threshold
     detector.set_minioi_ms(40)  # Slightly shorter minimum interval between onsets
     onset_detectors[method] = detector
 
 # Initialize aubio pitch detection
-# Note: hop_size is set to BUFFER_SIZE (512)
-pitch_detector = aubio.pitch("yin", BUFFER_SIZE, BUFFER_SIZE, SAMPLE_RATE)
+pitch_detector = aubio.pitch("yin", BUFFER_SIZE, HOP_SIZE, SAMPLE_RATE)
 pitch_detector.set_unit("Hz")
 pitch_detector.set_silence(-40)
 
 # Initialize tempo detection (BPM)
-tempo_detector = aubio.tempo("specdiff", BUFFER_SIZE, BUFFER_SIZE, SAMPLE_RATE)
+tempo_detector = aubio.tempo("specdiff", BUFFER_SIZE, HOP_SIZE, SAMPLE_RATE)
 tempo_detector.set_threshold(0.2)
 
-# Initialize note detection
-note_detector = aubio.notes("default", BUFFER_SIZE, BUFFER_SIZE, SAMPLE_RATE)
-note_detector.set_silence(-40)
-note_detector.set_minioi_ms(50)  # Minimum interval between notes (ms)
 
-# Initialize FFT for spectral analysis
-fft = aubio.fft(BUFFER_SIZE)
-
-# We no longer need to store beat timestamps as we use aubio's BPM detection
+# Frequency ranges for the note block display
+# Map expanded musical range (roughly 20Hz-5000Hz) to 8 blocks
+# Each block represents a range of frequencies
+FREQ_RANGES = [
+    (20, 80),  # Sub-bass (very low)
+    (80, 250),  # Bass
+    (250, 500),  # Low-mids
+    (500, 1000),  # Mids
+    (1000, 2000),  # Upper-mids
+    (2000, 3000),  # Presence
+    (3000, 4000),  # Brilliance
+    (4000, 8000),  # Air/Ultra high
+]
+
+
+# Frequency band blocks with at most one block lit up
+def note_blocks_text(lit_index=None, lit_block=""):
+    return "".join(
+        lit_block if i == lit_index else "□ "  # Empty block
+        for i in range(len(FREQ_RANGES))
+    )
 
-# This function has been removed as we're now using aubio's BPM detection
 
+# The ranges are contiguous, so a binary search over their edges finds the block
+FREQ_EDGES = np.array(
+    [min_freq for min_freq, _ in FREQ_RANGES] + [FREQ_RANGES[-1][1]],
+    dtype=np.float32,
+)
 
-# Simple function to create a real-time display table
-def create_audio_table(onset_results, pitch, pitch_confidence, note, volume, aubio_bpm):
+# Precomputed block strings for every possible pitch position, indexed by
+# 2 * block + highlight_note. The last entry is for a pitch outside every range
+NOTE_BLOCKS = tuple(
+    note_blocks_text(i, block)
+    for i in range(len(FREQ_RANGES))
+    # Pitch detected but not confirmed as musical note - use half-filled block
+    # Musical note detected in this range - use filled block with bright color
+    for block in ("▣ ", "■ ")
+) + (note_blocks_text(),)
+EMPTY_NOTE_BLOCKS_INDEX = len(NOTE_BLOCKS) - 1
+
+# Update the display table every N audio frames (~46ms at 512 samples/hop)
+DISPLAY_INTERVAL = 4
+
+# Fixed row positions in the display table
+FREQ_BANDS_ROW = len(ONSET_METHODS)
+KICK_ROW = FREQ_BANDS_ROW + 1
+HIHAT_ROW = FREQ_BANDS_ROW + 2
+BPM_ROW = FREQ_BANDS_ROW + 3
+
+# Table cells as styled Text objects, updated in place so Rich never has to
+# parse markup on a refresh
+feature_cells = [
+    Text(f"{METHOD_DESCRIPTIONS.get(method, method):<15}") for method in ONSET_METHODS
+] + [Text(label.ljust(15)) for label in ("Freq Bands", "Kick", "Hi-Hat", "BPM")]
+value_cells = [Text("") for _ in feature_cells]
+value_cells[FREQ_BANDS_ROW].style = "blue"
+
+
+# Create the real-time display table once; update_audio_table fills in its cells
+def create_audio_table():
     table = Table(title=f"Real-time Audio Analysis")
 
     table.add_column("Feature", style="cyan")
     table.add_column("Value", style="green", width=15, justify="right")
 
+    for feature, value in zip(feature_cells, value_cells):
+        table.add_row(feature, value)
+
+    return table
+
+
+# Update the table cells in place with the latest analysis results
+def update_audio_table(
+    onset_results, pitch, pitch_confidence, note_detected, volume, aubio_bpm
+):
     # Beat detection from all methods
-    for method in ONSET_METHODS:
-        is_beat, descriptor, threshold = onset_results[method]
-        beat_display = "[bold green]YES[/bold green]" if is_beat else "[dim]no[/dim]"
-        ratio = descriptor / threshold if threshold > 0 else 0
+    for row, method in enumerate(ONSET_METHODS):
+        is_beat = onset_results[method]
+        if is_beat:
+            value_cells[row].plain = "YES"
+            value_cells[row].style = "bold green"
+        else:
+            value_cells[row].plain = "no"
+            value_cells[row].style = "dim"
 
         # Use color coding for the method name based on whether it detected a beat
-        method_color = "green" if is_beat else "cyan"
-        method_desc = METHOD_DESCRIPTIONS[method]
-
-        table.add_row(
-            f"[{method_color}]{method_desc:<15}[/{method_color}]", f"{beat_display:>15}"
-        )
-
-    # Note detection
-    note_detected = note.size > 0 and note[0] > 0
-
-    # Create a simple visualization with ASCII blocks based on pitch
-    # Map the pitch to our 8 blocks (we know pitch is reliable)
-    note_blocks = ""
-
-    # Use pitch frequency for the visualization
-    # Map expanded musical range (roughly 20Hz-5000Hz) to 8 blocks
-    # Each block represents a range of frequencies
-    freq_ranges = [
-        (20, 80),  # Sub-bass (very low)
-        (80, 250),  # Bass
-        (250, 500),  # Low-mids
-        (500, 1000),  # Mids
-        (1000, 2000),  # Upper-mids
-        (2000, 3000),  # Presence
-        (3000, 4000),  # Brilliance
-        (4000, 8000),  # Air/Ultra high
-    ]
+        feature_cells[row].style = "green" if is_beat else "cyan"
 
     # Light up the block corresponding to the current pitch
     # Also consider the note detection for coloring
     highlight_note = note_detected and pitch_confidence > 0.4
-    for i, (min_freq, max_freq) in enumerate(freq_ranges):
-        if min_freq <= pitch < max_freq:
-            if highlight_note:
-                # Musical note detected in this range - use filled block with bright color
-                note_blocks += "■ "  # Filled block
-            else:
-                # Pitch detected but not confirmed as musical note
-                note_blocks += "▣ "  # Half-filled block
-        else:
-            note_blocks += "□ "  # Empty block
+    block = int(np.searchsorted(FREQ_EDGES, pitch, side="right")) - 1
+    if 0 <= block < len(FREQ_RANGES):
+        note_blocks_index = 2 * block + highlight_note
+    else:
+        note_blocks_index = EMPTY_NOTE_BLOCKS_INDEX
 
     # Add frequency visualization - just the blocks without the note detection status
-    table.add_row("Freq Bands".ljust(15), f"[blue]{note_blocks}[/blue]".rjust(15))
+    value_cells[FREQ_BANDS_ROW].plain = NOTE_BLOCKS[note_blocks_index]
 
     # Kick drum detection - using energy detector
     # Energy is good at detecting low frequency transients like kick drums
     kick_detected = False
     if "energy" in onset_results:
-        is_energy_beat = onset_results["energy"][0]
+        is_energy_beat = onset_results["energy"]
         if is_energy_beat:
             kick_detected = True
 
     # Create a visual indicator for kick drum detection
     if kick_detected:
-        kick_indicator = "[bold red]⚫ KICK ⚫[/bold red]"
+        value_cells[KICK_ROW].plain = "⚫ KICK ⚫"
+        value_cells[KICK_ROW].style = "bold red"
     else:
-        kick_indicator = "[dim]----------[/dim]"
-    table.add_row("Kick".ljust(15), f"{kick_indicator}".rjust(15))
+        value_cells[KICK_ROW].plain = "----------"
+        value_cells[KICK_ROW].style = "dim"
 
     # Hi-hat detection - using expanded 4500-6000 Hz frequency range
     # This targets the primary hi-hat frequencies we identified (centered on 5211 Hz)
@@ -170,19 +226,15 @@ def create_audio_table(onset_results, pitch, pitch_confidence, note, volume, aub
 
     # Create a more visual indicator for hi-hat detection
     if hihat_detected:
-        hihat_indicator = f"[bold yellow]✧✧ +++ ✧✧[/bold yellow]"
+        value_cells[HIHAT_ROW].plain = "✧✧ +++ ✧✧"
+        value_cells[HIHAT_ROW].style = "bold yellow"
     else:
-        hihat_indicator = "[dim]----------[/dim]"
-    table.add_row("Hi-Hat".ljust(15), f"{hihat_indicator}".rjust(15))
+        value_cells[HIHAT_ROW].plain = "----------"
+        value_cells[HIHAT_ROW].style = "dim"
 
     # BPM from aubio's estimation
-    aubio_bpm_color = "green" if aubio_bpm > 10 else "dim"
-    table.add_row(
-        "BPM".ljust(15),
-        f"[{aubio_bpm_color}]{aubio_bpm:6.1f}[/{aubio_bpm_color}]".rjust(15),
-    )
-
-    return table
+    value_cells[BPM_ROW].plain = f"{aubio_bpm:6.1f}"
+    value_cells[BPM_ROW].style = "green" if aubio_bpm > 10 else "dim"
 
 
 # Main processing loop
@@ -191,50 +243,67 @@ console.print("[bold]Listening for music... Press Ctrl+C to stop[/bold]")
 
 # Use Rich's Live display for real-time updates
 try:
-    with Live(refresh_per_second=10) as live:
+    table = create_audio_table()
+    frame_count = 0
+    ring_tail = 0  # Total number of frames consumed by the main loop
+    aubio_bpm = 0.0
+    with Live(table, refresh_per_second=10) as live:
         while True:
-            # Read audio data
-            audiobuffer = stream.read(BUFFER_SIZE, exception_on_overflow=False)
-            signal = np.frombuffer(audiobuffer, dtype=np.float32)
-
-            # Detect beat/onset with all methods
-            onset_results = {}
-            any_beat_detected = False
-            for method, detector in onset_detectors.items():
-                is_beat = detector(signal)
-                descriptor = detector.get_descriptor()
-                threshold = detector.get_threshold()
-                onset_results[method] = (is_beat, descriptor, threshold)
-                if is_beat:
-                    any_beat_detected = True
-
-            # Check tempo detector
-            is_tempo_beat = tempo_detector(signal)
-
-            # Get aubio's built-in tempo estimation
-            aubio_bpm = tempo_detector.get_bpm()
-
-            # Detect pitch
-            pitch = pitch_detector(signal)[0]
-            pitch_confidence = pitch_detector.get_confidence()
-
-            # Detect notes
-            note = note_detector(signal)
-
-            # We no longer need spectral analysis or energy band calculations
-            # as we're only using the note detection and pitch information
-
-            # Calculate overall volume level (used for hi-hat detection criteria)
-            volume = np.sqrt(np.mean(signal**2))
-
-            # Always update the display in real-time
-            table = create_audio_table(
-                onset_results, pitch, pitch_confidence, note, volume, aubio_bpm
-            )
-            live.update(table)
-
-            # Small delay to reduce CPU usage
-            time.sleep(0.01)
+            # Wait for the callback, then drain every frame captured since
+            audio_ready.wait()
+            audio_ready.clear()
+            head = ring_head
+            if head - ring_tail > RING_FRAMES:
+                # We fell behind by a whole ring; skip the overwritten frames
+                ring_tail = head - RING_FRAMES
+
+            while ring_tail < head:
+                signal = audio_ring[ring_tail % RING_FRAMES]
+                ring_tail += 1
+
+                # Detect beat/onset with all methods
+                onset_results = {}
+                any_beat_detected = False
+                for method, detector in onset_detectors.items():
+                    is_beat = detector(signal)
+                    onset_results[method] = is_beat
+                    if is_beat:
+                        any_beat_detected = True
+
+                # Check tempo detector
+                is_tempo_beat = tempo_detector(signal)
+
+                # Get aubio's built-in tempo estimation; it only changes on a
+                # tempo beat, so keep the last value otherwise
+                if is_tempo_beat:
+                    aubio_bpm = tempo_detector.get_bpm()
+
+                # Detect pitch
+                pitch = pitch_detector(signal)[0]
+                pitch_confidence = pitch_detector.get_confidence()
+
+                # Treat an onset with a confident pitch as a musical note
+                note_detected = any_beat_detected and pitch_confidence > 0.4
+
+                # We no longer need spectral analysis or energy band calculations
+                # as we're only using the note detection and pitch information
+
+                # Calculate overall volume level (used for hi-hat detection criteria)
+                # np.dot gives the sum of squares without a squared temporary
+                volume = np.sqrt(np.dot(signal, signal) / HOP_SIZE)
+
+                # Update the table every few frames; Live redraws it on its own
+                # refresh_per_second schedule
+                frame_count += 1
+                if frame_count % DISPLAY_INTERVAL == 0:
+                    update_audio_table(
+                        onset_results,
+                        pitch,
+                        pitch_confidence,
+                        note_detected,
+                        volume,
+                        aubio_bpm,
+                    )
 
 except KeyboardInterrupt:
     console.print("[bold red]Stopping...[/bold red]")
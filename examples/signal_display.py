@@ -1,9 +1,11 @@
-import json
+import orjson
 import time
 import os
+import queue
+import socket
+import threading
 import pygame
 import paho.mqtt.client as mqtt
-from datetime import datetime
 import numpy as np
 
 # Window setup
@@ -48,22 +50,86 @@ FREQ_RANGES = [
     (3000, 4000),  # Brilliance
     (4000, 8000),  # Air/Ultra high
 ]
+FREQ_EDGES = np.array([low for low, _ in FREQ_RANGES] + [FREQ_RANGES[-1][1]])
 
 # Initialize data storage
 latest_data = None
+latest_time = ""  # HH:MM:SS of latest_data's ISO timestamp
+MAX_HISTORY = 200  # Store maximum 200 data points for each signal
+
+# Fixed-size ring buffers, one slot per message. write_idx counts every message
+# received, so the newest entry is at (write_idx - 1) % MAX_HISTORY
+# Onset methods keep their descriptor values in history and their beat flags in
+# a parallel array in beat_history
 history = {
-    "energy": [],
-    "hfc": [],
-    "complex": [],
-    "phase": [],
-    "specflux": [],
-    "pitch": [],
-    "confidence": [],
-    "kick": [],
-    "hihat": [],
-    "bpm": [],
+    key: np.zeros(MAX_HISTORY, dtype=np.float32)
+    for key in ONSET_METHODS + ["pitch", "confidence", "kick", "hihat", "bpm"]
 }
-MAX_HISTORY = 200  # Store maximum 200 data points for each signal
+beat_history = {
+    method: np.zeros(MAX_HISTORY, dtype=np.bool_) for method in ONSET_METHODS
+}
+threshold_history = {
+    method: np.zeros(MAX_HISTORY, dtype=np.float32) for method in ONSET_METHODS
+}
+write_idx = 0
+
+# Number of beats currently held in each beat_history ring, kept up to date as
+# slots are overwritten so drawing never has to count them
+beat_counts = {method: 0 for method in ONSET_METHODS}
+
+# Every ring buffer keyed by the field name used in the pending lists
+buffers = {
+    **history,
+    **{f"{method}_beat": beat_history[method] for method in ONSET_METHODS},
+    **{f"{method}_threshold": threshold_history[method] for method in ONSET_METHODS},
+}
+
+# Raw MQTT payloads waiting to be parsed off the network thread
+raw_queue = queue.SimpleQueue()
+
+# Parsed values waiting to be written into the ring buffers, one list per field.
+# The parser thread appends under pending_lock and the pygame loop swaps the
+# whole dict out once per frame
+pending_lock = threading.Lock()
+pending = {key: [] for key in buffers}
+
+
+def history_window(buffer, count):
+    """Return the last count entries of a ring buffer, oldest first"""
+    if count < MAX_HISTORY:
+        return buffer[:count]
+    start = count % MAX_HISTORY
+    return np.concatenate((buffer[start:], buffer[:start]))
+
+
+# Default font instances shared between displays, keyed by size
+_fonts = {}
+
+
+def get_font(size):
+    """Return the shared default font of the given size, loading it once"""
+    font = _fonts.get(size)
+    if font is None:
+        font = pygame.font.Font(None, size)
+        _fonts[size] = font
+    return font
+
+
+# Rendered text surfaces keyed by (font, text, color)
+_text_cache = {}
+TEXT_CACHE_SIZE = 512
+
+
+def render_cached(font, text, color):
+    """Render antialiased text, reusing the surface if it was rendered before"""
+    key = (font, text, color)
+    text_surface = _text_cache.get(key)
+    if text_surface is None:
+        if len(_text_cache) >= TEXT_CACHE_SIZE:
+            _text_cache.clear()
+        text_surface = font.render(text, True, color)
+        _text_cache[key] = text_surface
+    return text_surface
 
 
 class TimeSeriesDisplay:
@@ -86,6 +152,7 @@ class TimeSeriesDisplay:
         self.y = y
         self.width = width
         self.height = height
+        self.rect = pygame.Rect(x, y, width, height)
         self.max_points = max_points
         self.line_color = line_color
         self.label = label
@@ -95,75 +162,77 @@ class TimeSeriesDisplay:
         self.threshold_display = threshold_display
         self.threshold_color = threshold_color
         self.threshold_value = 0.5  # Default threshold value
+        self.font = get_font(22)
+        self.background = self.render_background()
 
-    def draw(self, surface, data_points, threshold_values=None):
-        # Draw background
-        pygame.draw.rect(
-            surface, (20, 20, 30), (self.x, self.y, self.width, self.height)
-        )
-        pygame.draw.rect(
-            surface, (50, 50, 60), (self.x, self.y, self.width, self.height), 1
-        )
+        # x positions of the plotted points, keyed by the number of points
+        self.x_positions = {}
+
+        # Beat marker sprite, blitted centered on each beat detection point
+        self.beat_marker = pygame.Surface((8, 8), pygame.SRCALPHA).convert_alpha()
+        self.beat_marker.fill((0, 0, 0, 0))
+        pygame.draw.circle(self.beat_marker, (255, 255, 255), (4, 4), 4)
+
+    def render_background(self):
+        # Render the static background, border, grid and min/max values once
+        background = pygame.Surface((self.width, self.height)).convert()
+        background.fill((20, 20, 30))
+        pygame.draw.rect(background, (50, 50, 60), (0, 0, self.width, self.height), 1)
 
         # Draw grid
         if self.show_grid:
             # Vertical grid lines
             for i in range(10):
-                line_x = self.x + (i / 10) * self.width
+                line_x = (i / 10) * self.width
                 pygame.draw.line(
-                    surface,
-                    GRID_COLOR,
-                    (line_x, self.y),
-                    (line_x, self.y + self.height),
-                    1,
+                    background, GRID_COLOR, (line_x, 0), (line_x, self.height), 1
                 )
 
             # Horizontal grid lines
             for i in range(5):
-                line_y = self.y + (i / 5) * self.height
+                line_y = (i / 5) * self.height
                 pygame.draw.line(
-                    surface,
-                    GRID_COLOR,
-                    (self.x, line_y),
-                    (self.x + self.width, line_y),
-                    1,
+                    background, GRID_COLOR, (0, line_y), (self.width, line_y), 1
                 )
 
+        # Draw min/max values
+        min_val_surface = self.font.render(f"{self.y_min}", True, (150, 150, 150))
+        max_val_surface = self.font.render(f"{self.y_max}", True, (150, 150, 150))
+        background.blit(min_val_surface, (5, self.height - 20))
+        background.blit(max_val_surface, (5, 20))
+
+        return background
+
+    # Draw the label and data over the background, which the caller blits first
+    # so that every display's background goes out in one batched blit
+    def draw(
+        self, surface, data_points, threshold_values=None, beats=None, beat_count=0
+    ):
+        # Keep every primitive inside this display's rect
+        previous_clip = surface.get_clip()
+        surface.set_clip(self.rect)
+
         # Draw label and beat count if applicable
-        font = pygame.font.Font(None, 22)
-        beat_count = sum(
-            1 for point in data_points if isinstance(point, tuple) and point[0]
-        )
         label_text = (
             f"{self.label} (Beats: {beat_count})" if beat_count > 0 else self.label
         )
-        label_surface = font.render(label_text, True, self.line_color)
+        label_surface = render_cached(self.font, label_text, self.line_color)
         surface.blit(label_surface, (self.x + 5, self.y + 5))
 
-        # Draw min/max values
-        min_val_surface = font.render(f"{self.y_min}", True, (150, 150, 150))
-        max_val_surface = font.render(f"{self.y_max}", True, (150, 150, 150))
-        surface.blit(min_val_surface, (self.x + 5, self.y + self.height - 20))
-        surface.blit(max_val_surface, (self.x + 5, self.y + 20))
-
         # Draw time series data
         if len(data_points) > 1:
             # Scale data to fit the graph
-            scaled_points = []
-            display_points = (
-                data_points[-self.max_points :]
-                if len(data_points) > self.max_points
-                else data_points
-            )
+            display_points = data_points[-self.max_points :]
+            num_points = len(display_points)
 
             # Draw threshold line if available
             if (
                 self.threshold_display
-                and threshold_values
+                and threshold_values is not None
                 and len(threshold_values) > 0
             ):
                 # Get the most recent threshold
-                threshold = threshold_values[-1]
+                threshold = float(threshold_values[-1])
                 # Normalize threshold
                 norm_threshold = (threshold - self.y_min) / (self.y_max - self.y_min)
                 norm_threshold = max(0, min(1, norm_threshold))
@@ -180,32 +249,36 @@ class TimeSeriesDisplay:
                     1,
                 )
 
-            # Process and draw main data points
-            for i, value in enumerate(display_points):
-                # Check if value is a tuple (is_beat, descriptor)
-                if isinstance(value, tuple):
-                    is_beat, descriptor = value
-                    value = descriptor  # Use descriptor for the graph
-
-                # Normalize value between y_min and y_max
-                normalized = (value - self.y_min) / (self.y_max - self.y_min)
-                normalized = max(0, min(1, normalized))  # Clamp between 0 and 1
-
-                # Calculate x,y position
-                point_x = self.x + (i / len(display_points)) * self.width
-                point_y = self.y + self.height - (normalized * self.height)
-
-                # If it's a beat detection point, draw a circle
-                if isinstance(display_points[i], tuple) and display_points[i][0]:
-                    pygame.draw.circle(
-                        surface, (255, 255, 255), (int(point_x), int(point_y)), 4
-                    )
+            # Normalize values between y_min and y_max, clamped between 0 and 1
+            normalized = np.clip(
+                (display_points - self.y_min) / (self.y_max - self.y_min), 0, 1
+            )
 
-                scaled_points.append((point_x, point_y))
+            # Calculate x,y positions for all points at once
+            xs = self.x_positions.get(num_points)
+            if xs is None:
+                xs = self.x + np.arange(num_points) * (self.width / num_points)
+                self.x_positions[num_points] = xs
+            ys = self.y + self.height - normalized * self.height
+
+            # Draw a circle at each beat detection point in one batched blit
+            if beats is not None:
+                beat_idx = np.flatnonzero(beats[-num_points:])
+                marker_xs = xs[beat_idx].astype(int) - 4
+                marker_ys = ys[beat_idx].astype(int) - 4
+                surface.blits(
+                    [
+                        (self.beat_marker, position)
+                        for position in zip(marker_xs.tolist(), marker_ys.tolist())
+                    ],
+                    doreturn=False,
+                )
 
             # Draw line connecting the points
-            if len(scaled_points) > 1:
-                pygame.draw.lines(surface, self.line_color, False, scaled_points, 2)
+            scaled_points = np.column_stack((xs, ys)).tolist()
+            pygame.draw.lines(surface, self.line_color, False, scaled_points, 2)
+
+        surface.set_clip(previous_clip)
 
 
 class FrequencyBandVisualizer:
@@ -214,11 +287,16 @@ class FrequencyBandVisualizer:
         self.y = y
         self.width = width
         self.height = height
-        self.font = pygame.font.Font(None, 24)
+        self.font = get_font(24)
         self.block_width = width // len(FREQ_RANGES)
 
+        # Calculate dimensions for square blocks
+        self.block_size = min(self.block_width - 10, (self.height - 80) // 2)
+        self.block_y = self.y + 50  # Position after title
+        self.background = self.render_background()
+
         # Store active bands with smoothing
-        self.active_bands = [0] * len(FREQ_RANGES)  # Activity level for each band (0-1)
+        self.active_bands = np.zeros(len(FREQ_RANGES))  # Activity level (0-1)
         self.decay_rate = 0.05  # How quickly inactive bands fade out
         self.rise_rate = 0.3  # How quickly active bands light up
 
@@ -229,61 +307,53 @@ class FrequencyBandVisualizer:
     def update(self, pitch, pitch_confidence, note_detected):
         self.note_detected = note_detected
         self.confidence = pitch_confidence
-        old_active = self.active_idx
-        self.active_idx = -1
 
         # Find which frequency band the pitch falls into
-        for i, (min_freq, max_freq) in enumerate(FREQ_RANGES):
-            if min_freq <= pitch < max_freq:
-                self.active_idx = i
-                # Gradually increase active band brightness
-                self.active_bands[i] += self.rise_rate
-                if self.active_bands[i] > 1:
-                    self.active_bands[i] = 1
-                break
-
-        # Apply decay to all inactive bands
-        for i in range(len(self.active_bands)):
-            if i != self.active_idx:  # Not the active band
-                self.active_bands[i] -= self.decay_rate
-                if self.active_bands[i] < 0:
-                    self.active_bands[i] = 0
-
-    def draw(self, surface):
-        # Draw background
-        pygame.draw.rect(
-            surface, (20, 20, 30), (self.x, self.y, self.width, self.height)
-        )
-        pygame.draw.rect(
-            surface, (50, 50, 60), (self.x, self.y, self.width, self.height), 1
-        )
+        band = int(np.searchsorted(FREQ_EDGES, pitch, side="right")) - 1
+        self.active_idx = band if 0 <= band < len(FREQ_RANGES) else -1
+
+        # Gradually increase active band brightness and decay all the others
+        if self.active_idx >= 0:
+            active_level = self.active_bands[band] + self.rise_rate
+            self.active_bands -= self.decay_rate
+            self.active_bands[band] = active_level
+        else:
+            self.active_bands -= self.decay_rate
+        np.clip(self.active_bands, 0, 1, out=self.active_bands)
+
+    def render_background(self):
+        # Render the static background, border, title and band labels once
+        background = pygame.Surface((self.width, self.height)).convert()
+        background.fill((20, 20, 30))
+        pygame.draw.rect(background, (50, 50, 60), (0, 0, self.width, self.height), 1)
 
         # Draw title
-        title = "Frequency Bands"
-        title_surface = self.font.render(title, True, (200, 200, 200))
-        surface.blit(title_surface, (self.x + 10, self.y + 10))
-
-        # Calculate dimensions for square blocks
-        block_size = min(self.block_width - 10, (self.height - 80) // 2)
-        block_y = self.y + 50  # Position after title
+        title_surface = self.font.render("Frequency Bands", True, (200, 200, 200))
+        background.blit(title_surface, (10, 10))
 
         # Draw frequency band labels
+        label_font = get_font(18)
+        block_size = self.block_size
+        label_y = self.block_y - self.y + block_size + 5
         for i, (min_freq, max_freq) in enumerate(FREQ_RANGES):
-            x = self.x + i * self.block_width + (self.block_width - block_size) // 2
+            x = i * self.block_width + (self.block_width - block_size) // 2
 
             # Draw frequency label (only for some bands to avoid clutter)
             if i % 2 == 0:
-                label = f"{min_freq}"
-                label_surface = pygame.font.Font(None, 18).render(
-                    label, True, (150, 150, 150)
-                )
+                label_surface = label_font.render(f"{min_freq}", True, (150, 150, 150))
                 label_width = label_surface.get_width()
                 # Center the label under the block
-                surface.blit(
-                    label_surface,
-                    (x + (block_size - label_width) // 2, block_y + block_size + 5),
+                background.blit(
+                    label_surface, (x + (block_size - label_width) // 2, label_y)
                 )
 
+        return background
+
+    # Draw the blocks over the background, which the caller blits once
+    def draw(self, surface):
+        block_size = self.block_size
+        block_y = self.block_y
+
         # Draw the blocks
         for i, (min_freq, max_freq) in enumerate(FREQ_RANGES):
             x = self.x + i * self.block_width + (self.block_width - block_size) // 2
@@ -325,7 +395,9 @@ def on_connect(client, userdata, flags, rc):
     """Callback for when the client connects to the broker"""
     if rc == 0:
         print(f"Connected to MQTT broker")
-        client.subscribe(MQTT_TOPIC)
+        # Deliver small packets immediately instead of waiting on Nagle's algorithm
+        client.socket().setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        client.subscribe(MQTT_TOPIC, qos=0)
         print(f"Subscribed to topic: {MQTT_TOPIC}")
     else:
         print(f"Failed to connect to MQTT broker with code: {rc}")
@@ -333,54 +405,97 @@ def on_connect(client, userdata, flags, rc):
 
 def on_message(client, userdata, msg):
     """Callback for when a message is received from the broker"""
+    raw_queue.put_nowait(msg.payload)
+
+
+def parse_messages():
+    """Parse queued payloads and write them into the history buffers"""
+    while True:
+        store_message(raw_queue.get())
+
+
+def store_message(payload):
+    """Decode one payload and queue its values for the next frame"""
     global latest_data
-    global history
+    global latest_time
 
     try:
-        data = json.loads(msg.payload.decode())
-        latest_data = data
+        data = orjson.loads(payload)
+        values = {}
 
         # Update history for onset detection methods
-        for method in ["energy", "hfc", "complex", "phase", "specflux"]:
+        for method in ONSET_METHODS:
             if method in data["onsets"]:
                 onset_data = data["onsets"][method]
-                # Store both beat detection and descriptor value as a tuple
-                is_beat = onset_data["is_beat"]
-                descriptor = onset_data["descriptor"]
-                threshold = onset_data["threshold"]
-
-                # Store as tuple (is_beat, descriptor)
-                history[method].append((is_beat, descriptor))
-                if len(history[method]) > MAX_HISTORY:
-                    history[method] = history[method][-MAX_HISTORY:]
+                # Store both beat detection and descriptor value
+                values[f"{method}_beat"] = onset_data["is_beat"]
+                values[method] = onset_data["descriptor"]
+                values[f"{method}_threshold"] = onset_data["threshold"]
+            else:
+                values[f"{method}_beat"] = False
+                values[method] = 0.0
+                values[f"{method}_threshold"] = 0.0
 
         # Update pitch and confidence
-        history["pitch"].append(data["pitch"]["value"])
-        history["confidence"].append(data["pitch"]["confidence"])
-        if len(history["pitch"]) > MAX_HISTORY:
-            history["pitch"] = history["pitch"][-MAX_HISTORY:]
-            history["confidence"] = history["confidence"][-MAX_HISTORY:]
+        values["pitch"] = data["pitch"]["value"]
+        values["confidence"] = data["pitch"]["confidence"]
 
         # Update kick/hihat/bpm
-        history["kick"].append(1.0 if data["kick_detected"] else 0.0)
-        history["hihat"].append(1.0 if data["hihat_detected"] else 0.0)
-        history["bpm"].append(data["tempo"]["bpm"])
-        if len(history["kick"]) > MAX_HISTORY:
-            history["kick"] = history["kick"][-MAX_HISTORY:]
-            history["hihat"] = history["hihat"][-MAX_HISTORY:]
-            history["bpm"] = history["bpm"][-MAX_HISTORY:]
+        values["kick"] = 1.0 if data["kick_detected"] else 0.0
+        values["hihat"] = 1.0 if data["hihat_detected"] else 0.0
+        values["bpm"] = data["tempo"]["bpm"]
+
+        with pending_lock:
+            for key, value in values.items():
+                pending[key].append(value)
+            latest_data = data
+            latest_time = data["timestamp"][11:19]
 
     except Exception as e:
         print(f"Error parsing message: {e}")
 
 
+def flush_pending():
+    """Write every value parsed since the last frame into the ring buffers"""
+    global pending
+    global write_idx
+
+    with pending_lock:
+        batch = pending
+        pending = {key: [] for key in buffers}
+
+    received = len(batch["bpm"])
+    if received == 0:
+        return
+
+    # Only the newest MAX_HISTORY entries can survive in the ring
+    kept = min(received, MAX_HISTORY)
+    slots = np.arange(write_idx + received - kept, write_idx + received) % MAX_HISTORY
+    overwritten = {
+        method: int(np.count_nonzero(buffer[slots]))
+        for method, buffer in beat_history.items()
+    }
+    for key, buffer in buffers.items():
+        buffer[slots] = batch[key][-kept:]
+    for method, buffer in beat_history.items():
+        beat_counts[method] += (
+            int(np.count_nonzero(buffer[slots])) - overwritten[method]
+        )
+    write_idx += received
+
+
 def main():
     # Initialize Pygame
     pygame.init()
-    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    screen = pygame.display.set_mode(
+        (WIDTH, HEIGHT), pygame.HWSURFACE | pygame.DOUBLEBUF
+    )
     pygame.display.set_caption("BeatZero Signal Display")
     clock = pygame.time.Clock()
 
+    # Parse incoming messages on a worker thread
+    threading.Thread(target=parse_messages, daemon=True).start()
+
     # Initialize MQTT client
     client = mqtt.Client(client_id=MQTT_CLIENT_ID)
     client.on_connect = on_connect
@@ -458,9 +573,6 @@ def main():
         ),
     }
 
-    # Threshold history for each method
-    threshold_history = {method: [] for method in ONSET_METHODS}
-
     # Pitch and confidence graph
     pitch_display = TimeSeriesDisplay(
         WIDTH // 2 + 10,
@@ -494,6 +606,26 @@ def main():
         label="Percussion Detection",
     )
 
+    # Kick and hihat overlays drawn over the percussion display
+    kick_display = TimeSeriesDisplay(
+        percussion_display.x,
+        percussion_display.y,
+        percussion_display.width,
+        percussion_display.height,
+        line_color=COLORS["kick"],
+        label="Kick (Red) & Hihat (White)",
+        show_grid=False,
+    )
+    hihat_display = TimeSeriesDisplay(
+        percussion_display.x,
+        percussion_display.y,
+        percussion_display.width,
+        percussion_display.height,
+        line_color=COLORS["hihat"],
+        label="",
+        show_grid=False,
+    )
+
     # BPM tracking
     bpm_display = TimeSeriesDisplay(
         WIDTH // 2 + 10,
@@ -512,8 +644,30 @@ def main():
     )
 
     # Font for on-screen info
-    font = pygame.font.Font(None, 32)
-    small_font = pygame.font.Font(None, 24)
+    font = get_font(32)
+    small_font = get_font(24)
+
+    # History windows and the rendered graphs, rebuilt whenever write_idx moves
+    window_count = -1
+    frame = pygame.Surface((WIDTH, HEIGHT)).convert()
+
+    # Only the gaps between displays keep this fill. Every display repaints its
+    # own rect and all other drawing lands inside one, so it is never redone
+    frame.fill(BACKGROUND_COLOR)
+    frame.blit(freq_band_viz.background, (freq_band_viz.x, freq_band_viz.y))
+
+    # Backgrounds of every graph, redrawn together in one batched blit. The
+    # kick and hihat overlays share the percussion display's background
+    graph_backgrounds = [
+        (display.background, (display.x, display.y))
+        for display in [
+            *onset_displays.values(),
+            pitch_display,
+            confidence_display,
+            percussion_display,
+            bpm_display,
+        ]
+    ]
 
     # Main game loop
     running = True
@@ -526,58 +680,64 @@ def main():
                 if event.key == pygame.K_ESCAPE:
                     running = False
 
-        # Clear the screen
-        screen.fill(BACKGROUND_COLOR)
+        # Snapshot the history in chronological order, only when new messages
+        # have arrived since the last frame
+        flush_pending()
+        count = write_idx
+        if count != window_count:
+            window_count = count
+            window = {
+                key: history_window(buffer, count) for key, buffer in history.items()
+            }
+            threshold_window = {
+                method: history_window(buffer, count)
+                for method, buffer in threshold_history.items()
+            }
+            beat_window = {
+                method: history_window(buffer, count)
+                for method, buffer in beat_history.items()
+            }
+
+            # Redraw the graphs and text into the cached frame
+            frame.blits(graph_backgrounds, doreturn=False)
+
+            # Draw all time series displays with thresholds
+            for method, display in onset_displays.items():
+                display.draw(
+                    frame,
+                    window[method],
+                    threshold_window[method],
+                    beat_window[method],
+                    beat_counts[method],
+                )
 
-        # Update threshold history if new data available
-        if latest_data:
-            for method in ONSET_METHODS:
-                if method in latest_data["onsets"]:
-                    threshold = latest_data["onsets"][method]["threshold"]
-                    threshold_history[method].append(threshold)
-                    if len(threshold_history[method]) > MAX_HISTORY:
-                        threshold_history[method] = threshold_history[method][
-                            -MAX_HISTORY:
-                        ]
-
-        # Draw all time series displays with thresholds
-        for method, display in onset_displays.items():
-            display.draw(screen, history[method], threshold_history.get(method, []))
-
-        # Draw pitch and confidence displays
-        pitch_display.draw(screen, history["pitch"])
-        confidence_display.draw(screen, history["confidence"])
-
-        # Draw percussion display with both kick and hihat
-        if history["kick"] and history["hihat"]:
-            # Draw background first
-            percussion_display.draw(screen, [0] * len(history["kick"]))
-
-            # Draw kick detection
-            kick_display = TimeSeriesDisplay(
-                percussion_display.x,
-                percussion_display.y,
-                percussion_display.width,
-                percussion_display.height,
-                line_color=COLORS["kick"],
-                label="Kick (Red) & Hihat (White)",
-                show_grid=False,
-            )
-            kick_display.draw(screen, history["kick"])
-
-            # Draw hihat detection (with same dimensions)
-            hihat_display = TimeSeriesDisplay(
-                percussion_display.x,
-                percussion_display.y,
-                percussion_display.width,
-                percussion_display.height,
-                line_color=COLORS["hihat"],
-                show_grid=False,
-            )
-            hihat_display.draw(screen, history["hihat"])
+            # Draw pitch and confidence displays
+            pitch_display.draw(frame, window["pitch"])
+            confidence_display.draw(frame, window["confidence"])
 
-        # Draw BPM display
-        bpm_display.draw(screen, history["bpm"])
+            # Draw kick and hihat detection over the percussion background
+            kick_display.draw(frame, window["kick"])
+            hihat_display.draw(frame, window["hihat"])
+
+            # Draw BPM display
+            bpm_display.draw(frame, window["bpm"])
+
+            # No longer using a signal data table - we've removed it since the graphs show this data
+
+            # Display current BPM if available
+            if latest_data:
+                bpm_text = f"Current BPM: {latest_data['tempo']['bpm']:.1f}"
+                bpm_surface = render_cached(font, bpm_text, COLORS["bpm"])
+                frame.blit(bpm_surface, (WIDTH - 250, 10))
+
+                # Display timestamp
+                ts_surface = render_cached(
+                    small_font, f"Time: {latest_time}", (150, 150, 150)
+                )
+                frame.blit(ts_surface, (WIDTH - 250, 50))
+
+        # Reuse the cached frame when no new messages have arrived
+        screen.blit(frame, (0, 0))
 
         # Update and draw frequency band visualizer
         if latest_data:
@@ -588,21 +748,6 @@ def main():
             )
         freq_band_viz.draw(screen)
 
-        # No longer using a signal data table - we've removed it since the graphs show this data
-
-        # Display current BPM if available
-        if latest_data:
-            bpm_text = f"Current BPM: {latest_data['tempo']['bpm']:.1f}"
-            bpm_surface = font.render(bpm_text, True, COLORS["bpm"])
-            screen.blit(bpm_surface, (WIDTH - 250, 10))
-
-            # Display timestamp
-            timestamp = datetime.fromisoformat(latest_data["timestamp"]).strftime(
-                "%H:%M:%S"
-            )
-            ts_surface = small_font.render(f"Time: {timestamp}", True, (150, 150, 150))
-            screen.blit(ts_surface, (WIDTH - 250, 50))
-
         # Update the display
         pygame.display.flip()
 
@@ -1,9 +1,9 @@
-import json
+import orjson
+import zlib
 import time
 import os
 import pygame
 import paho.mqtt.client as mqtt
-from datetime import datetime
 import numpy as np
 
 # Window setup
@@ -33,8 +33,22 @@ COLORS = {
     "bpm": (255, 255, 255),  # White
 }
 
+# Onset methods that publish a descriptor and threshold
+SPECTRAL_METHODS = ["energy", "hfc", "complex", "phase", "specflux"]
+
+# Stand-in values for a spectral method missing from a message
+MISSING_ONSET = {"descriptor": 0.0, "threshold": 0.0, "is_beat": False}
+
+# Spectrum block colors, picked by which of the energy levels a band reaches
+SPECTRUM_LEVELS = np.array([0.3, 0.5, 0.7])
+SPECTRUM_LEVEL_COLORS = [(0, 0, 0), (125, 125, 125), (175, 175, 175), (255, 255, 255)]
+
 # Initialize data storage
 latest_data = None
+# Raw payload of the newest message and the last one parsed into latest_data.
+# Only the newest payload is parsed, once per frame at most
+latest_payload = None
+parsed_payload = None
 MAX_HISTORY = 200
 
 # Audio silence detection parameters
@@ -44,6 +58,60 @@ MAX_VOLUME_HISTORY = 100  # ~1 second at 100 updates/sec
 is_silent = False
 gain_multiplier = 1.0  # Gain multiplier for non-silent mode
 
+# Rendered text surfaces keyed by (font, text, color)
+_text_cache = {}
+TEXT_CACHE_SIZE = 128
+
+
+def render_cached(font, text, color):
+    """Render antialiased text, reusing the surface if it was rendered before"""
+    key = (font, text, color)
+    text_surface = _text_cache.get(key)
+    if text_surface is None:
+        if len(_text_cache) >= TEXT_CACHE_SIZE:
+            _text_cache.clear()
+        text_surface = font.render(text, True, color)
+        _text_cache[key] = text_surface
+    return text_surface
+
+
+# Bordered block surfaces keyed by (color, size), shared by the panels
+_block_surfaces = {}
+
+
+def block_surface(color, size):
+    """Return a square block of the given color with its border drawn in"""
+    key = (color, size)
+    block = _block_surfaces.get(key)
+    if block is None:
+        block = pygame.Surface((size, size)).convert()
+        block.fill(color)
+        pygame.draw.rect(block, (100, 100, 120), (0, 0, size, size), 1)
+        _block_surfaces[key] = block
+    return block
+
+
+def block_layout(viz, label_widths):
+    """Return the positions of a panel's blocks and of the labels under them"""
+    block_positions = []
+    label_positions = []
+    label_y = viz.block_y + viz.block_size + 5
+    for i, label_width in enumerate(label_widths):
+        x = viz.x + i * viz.block_width + (viz.block_width - viz.block_size) // 2
+        block_positions.append((x, viz.block_y))
+        # Center the label under the block
+        label_positions.append((x + (viz.block_size - label_width) // 2, label_y))
+    return block_positions, label_positions
+
+
+def render_chrome(visualizers):
+    """Render the window background and the panels' static parts once"""
+    chrome = pygame.Surface((WIDTH, HEIGHT)).convert()
+    chrome.fill(BACKGROUND_COLOR)
+    for viz in visualizers:
+        viz.draw_background(chrome)
+    return chrome
+
 
 class SpectrumVisualizer:
     def __init__(self, x, y, width, height):
@@ -54,7 +122,8 @@ class SpectrumVisualizer:
         self.font = pygame.font.Font(None, 24)
 
         # Store the FFT data
-        self.band_energy = [0.0] * 7  # 7 frequency bands after combining 1k-3k
+        self.band_energy = np.zeros(7)  # 7 frequency bands after combining 1k-3k
+        self.band_levels = [0] * 7  # Index into SPECTRUM_LEVEL_COLORS per band
         self.band_ranges = [
             (80, 250),  # Bass
             (250, 500),  # Low-mids
@@ -65,30 +134,47 @@ class SpectrumVisualizer:
             (5000, 8000),  # Ultra high (5-8kHz)
         ]
 
-        # Using grayscale for all frequency bands (black to white)
-        self.color_gradient = [
-            (
-                255,
-                255,
-                255,
-            ),  # White for all frequencies - using same color for simplicity
-            (255, 255, 255),
-            (255, 255, 255),
-            (255, 255, 255),
-            (255, 255, 255),
-            (255, 255, 255),
-            (255, 255, 255),
-        ]
-
         self.block_width = width // len(self.band_ranges)
 
+        # Calculate block size for frequency boxes (similar to onset detection)
+        self.block_size = min(self.block_width - 10, (self.height - 80) // 2)
+        self.block_y = self.y + 50  # Position after title
+
+        # Render the title and frequency labels once; the labels and the
+        # block positions are computed again only if the ranges change
+        self.label_font = pygame.font.Font(None, 18)
+        self.title_surface = self.font.render(
+            "Frequency Spectrum Analyzer", True, (200, 200, 200)
+        )
+        self.render_labels()
+
+    def render_labels(self):
+        # Render the frequency label under each block
+        self.label_surfaces = []
+        for min_freq, max_freq in self.band_ranges:
+            if min_freq > 999:
+                label = f"{min_freq // 1000}k"
+            else:
+                label = f"{min_freq}"
+            self.label_surfaces.append(
+                self.label_font.render(label, True, (150, 150, 150))
+            )
+        label_widths = [label.get_width() for label in self.label_surfaces]
+        self.block_positions, self.label_positions = block_layout(self, label_widths)
+        self.background_changed = True
+
     def update(self, spectrum_data):
         if "band_energy" in spectrum_data:
-            self.band_energy = spectrum_data["band_energy"]
+            self.band_energy = np.asarray(spectrum_data["band_energy"], dtype=float)
+            self.band_levels = np.searchsorted(
+                SPECTRUM_LEVELS, self.band_energy, side="right"
+            ).tolist()
         if "band_ranges" in spectrum_data:
-            self.band_ranges = spectrum_data["band_ranges"]
+            if spectrum_data["band_ranges"] != self.band_ranges:
+                self.band_ranges = spectrum_data["band_ranges"]
+                self.render_labels()
 
-    def draw(self, surface):
+    def draw_background(self, surface):
         # Draw background
         pygame.draw.rect(
             surface, (20, 20, 30), (self.x, self.y, self.width, self.height)
@@ -98,63 +184,22 @@ class SpectrumVisualizer:
         )
 
         # Draw title
-        title = "Frequency Spectrum Analyzer"
-        title_surface = self.font.render(title, True, (200, 200, 200))
-        surface.blit(title_surface, (self.x + 10, self.y + 10))
-
-        # Calculate block size for frequency boxes (similar to onset detection)
-        block_size = min(self.block_width - 10, (self.height - 80) // 2)
-        block_y = self.y + 50  # Position after title
-
-        # Draw frequency bands as illuminated blocks (similar to onset detection)
-        for i, energy in enumerate(self.band_energy):
-            # Position the block
-            x = self.x + i * self.block_width + (self.block_width - block_size) // 2
-
-            # Get base color from gradient
-            base_color = (
-                self.color_gradient[i]
-                if i < len(self.color_gradient)
-                else (200, 200, 200)
-            )
-
-            # Determine color based on energy level
-            if energy < 0.3:
-                color = (0, 0, 0)
-            elif energy < 0.5:
-                color = (125, 125, 125)
-            elif energy < 0.7:
-                color = (175, 175, 175)
-            else:
-                color = (255, 255, 255)
+        surface.blit(self.title_surface, (self.x + 10, self.y + 10))
 
-            # Draw the frequency block
-            pygame.draw.rect(surface, color, (x, block_y, block_size, block_size))
+        # Draw frequency label under each block
+        surface.blits(list(zip(self.label_surfaces, self.label_positions)), False)
+        self.background_changed = False
 
-            # Draw border around block
-            pygame.draw.rect(
-                surface, (100, 100, 120), (x, block_y, block_size, block_size), 1
-            )
-
-            # Draw frequency label under block
-            min_freq, max_freq = (
-                self.band_ranges[i] if i < len(self.band_ranges) else (0, 0)
-            )
-            if min_freq > 999:
-                label = f"{min_freq // 1000}k"
-            else:
-                label = f"{min_freq}"
-
-            label_surface = pygame.font.Font(None, 18).render(
-                label, True, (150, 150, 150)
-            )
-            label_width = label_surface.get_width()
+    def draw(self, surface):
+        # Bind what the loop uses to locals
+        blit = surface.blit
+        block_size = self.block_size
 
-            # Center the label under the block
-            surface.blit(
-                label_surface,
-                (x + (block_size - label_width) // 2, block_y + block_size + 5),
-            )
+        # Draw frequency bands as illuminated blocks (similar to onset detection)
+        for position, level in zip(self.block_positions, self.band_levels):
+            # Draw the frequency block with its border, colored by energy level
+            color = SPECTRUM_LEVEL_COLORS[level]
+            blit(block_surface(color, block_size), position)
 
 
 class BPMVisualizer:
@@ -184,9 +229,8 @@ class BPMVisualizer:
         self.blink_rect_y = self.y + 10
         self.blink_rect_height = self.height - 20
 
-        # For debugging
-        self.frame_count = 0
-        self.last_frame_time = 0
+        # Font for the beat timing info
+        self.timing_font = pygame.font.Font(None, 20)
 
     def update(self, bpm_data):
         current_time = pygame.time.get_ticks()
@@ -220,29 +264,13 @@ class BPMVisualizer:
         # Calculate time since last beat
         time_since_last = current_time - self.last_beat_time
 
-        # Debug frame rate
-        self.frame_count += 1
-        if current_time - self.last_frame_time > 1000:  # Every second
-            # Print frame rate for debugging
-            # print(f"FPS: {self.frame_count}, Beat interval: {self.beat_interval}ms")
-            self.frame_count = 0
-            self.last_frame_time = current_time
-
-        # Check if we're due for a new beat based on the scaled BPM
-        if time_since_last >= self.beat_interval:
-            # Calculate how many beats we've missed (should generally be just 1)
-            beats_missed = int(time_since_last / self.beat_interval)
-
-            # Update last beat time to be exactly on the beat grid
-            self.last_beat_time += beats_missed * self.beat_interval
+        # Keep the last beat time on the beat grid, however many beats have
+        # passed, and flash while within the flash duration of it
+        phase = time_since_last % self.beat_interval
+        self.last_beat_time = current_time - phase
+        self.is_beat = phase < self.flash_duration
 
-            # We're on a beat
-            self.is_beat = True
-        else:
-            # Check if we're within the flash duration
-            self.is_beat = time_since_last < self.flash_duration
-
-    def draw(self, surface):
+    def draw_background(self, surface):
         # Draw background
         pygame.draw.rect(
             surface, (20, 20, 30), (self.x, self.y, self.width, self.height)
@@ -251,9 +279,10 @@ class BPMVisualizer:
             surface, (50, 50, 60), (self.x, self.y, self.width, self.height), 1
         )
 
+    def draw(self, surface):
         # Draw BPM label showing both actual and scaled BPM
         bpm_text = f"BPM: {self.current_bpm:.1f} (Scaled: {self.scaled_bpm:.1f})"
-        bpm_label = self.font.render(bpm_text, True, (200, 200, 200))
+        bpm_label = render_cached(self.font, bpm_text, (200, 200, 200))
         surface.blit(bpm_label, (self.x + 10, self.label_y))
 
         # Draw blinking rectangle (right side of the BPM label)
@@ -317,9 +346,7 @@ class BPMVisualizer:
 
         # Draw beat timing info
         ms_per_beat = f"{self.beat_interval:.0f}ms/beat"
-        timing_label = pygame.font.Font(None, 20).render(
-            ms_per_beat, True, (150, 150, 150)
-        )
+        timing_label = render_cached(self.timing_font, ms_per_beat, (150, 150, 150))
         surface.blit(timing_label, (blink_rect_x + 5, self.blink_rect_y + 5))
 
 
@@ -332,21 +359,26 @@ class OnsetDetectionVisualizer:
         self.font = pygame.font.Font(None, 24)
 
         # Define onset methods
-        self.onset_methods = [
-            "energy",
-            "hfc",
-            "complex",
-            "phase",
-            "specflux",
-            "kick",
-            "hihat",
-        ]
+        self.onset_methods = SPECTRAL_METHODS + ["kick", "hihat"]
         self.block_width = width // len(self.onset_methods)
 
-        # Store active methods with smoothing
-        self.active_levels = {method: 0 for method in self.onset_methods}
+        # Calculate dimensions for blocks
+        self.block_size = min(self.block_width - 10, (self.height - 80) // 2)
+        self.block_y = self.y + 50  # Position after title
+
+        # Store active levels with smoothing, one slot per method in
+        # onset_methods order, spectral methods first
+        self.active_levels = np.zeros(len(self.onset_methods))
+        self.method_idx = {method: i for i, method in enumerate(self.onset_methods)}
+        self.changed = False  # Whether the last update moved any level
         self.decay_rate = 0.1  # Faster decay so lights go out quicker
-        self.rise_rate = 0.5  # Faster rise rate for more responsive visualization
+
+        # Block colors for each method at 256 activity levels, indexed by
+        # int(activity * 255)
+        self.color_luts = [
+            self.build_color_lut(COLORS.get(method, (200, 200, 200)))
+            for method in self.onset_methods
+        ]
 
         # Labels and positions
         self.labels = {
@@ -359,68 +391,104 @@ class OnsetDetectionVisualizer:
             "hihat": "Hi-hat",
         }
 
-    def update(self, data):
-        # Update onset detection methods with continuous scaling
-        for method in ["energy", "hfc", "complex", "phase", "specflux"]:
-            if method in data["onsets"]:
-                # Get the raw descriptor value and threshold
-                descriptor = data["onsets"][method]["descriptor"]
-                threshold = data["onsets"][method]["threshold"]
-                is_beat = data["onsets"][method]["is_beat"]
-
-                # Calculate normalized intensity - scale it relative to threshold
-                # Avoid division by very small values
-                if threshold > 0.01:
-                    normalized_intensity = descriptor / threshold
-                else:
-                    normalized_intensity = 0
-
-                if is_beat:
-                    # On beat detection, go to full brightness immediately
-                    self.active_levels[method] = 1.0
-                else:
-                    # For non-beats, only show if intensity is above 70% of threshold
-                    # This creates more contrast between active and inactive
-                    if normalized_intensity > 0.7:
-                        target_level = min(0.5, normalized_intensity - 0.7)
-                        self.active_levels[method] = max(
-                            self.active_levels[method], target_level
-                        )
-                    else:
-                        # Quickly fade out low levels
-                        self.active_levels[method] -= self.decay_rate * 2
-
-                # Apply decay - always fade out over time
-                self.active_levels[method] -= self.decay_rate
-
-                # Clamp values
-                self.active_levels[method] = max(
-                    0, min(1.0, self.active_levels[method])
-                )
+        # Render the title and method labels and lay out the blocks once
+        self.title_surface = self.font.render(
+            "Onset Detection Methods", True, (200, 200, 200)
+        )
+        label_font = pygame.font.Font(None, 18)
+        self.label_surfaces = [
+            label_font.render(self.labels.get(method, method), True, (150, 150, 150))
+            for method in self.onset_methods
+        ]
+        label_widths = [label.get_width() for label in self.label_surfaces]
+        self.block_positions, self.label_positions = block_layout(self, label_widths)
+
+    def build_color_lut(self, base_color):
+        # Brightness applies non-linear scaling (power of 1.5) for stronger
+        # contrast, and blocks are almost completely black when not active
+        lut = []
+        for step in range(256):
+            activity = step / 255
+            if activity < 0.1:
+                lut.append((1, 1, 3))
             else:
-                # Decay activity
-                self.active_levels[method] -= self.decay_rate
-                if self.active_levels[method] < 0:
-                    self.active_levels[method] = 0
+                activity_scaled = activity**1.5
+                lut.append(
+                    (
+                        int(base_color[0] * activity_scaled),
+                        int(base_color[1] * activity_scaled),
+                        int(base_color[2] * activity_scaled),
+                    )
+                )
+        return lut
+
+    def update(self, data):
+        # Gather the spectral methods' values in one pass each, marking
+        # methods missing from the data
+        levels = self.active_levels
+        previous_levels = levels.copy()
+        onsets = data["onsets"]
+        method_onsets = [
+            onsets.get(method, MISSING_ONSET) for method in SPECTRAL_METHODS
+        ]
+        present = np.array([method in onsets for method in SPECTRAL_METHODS])
+        descriptors = np.array([onset["descriptor"] for onset in method_onsets], float)
+        thresholds = np.array([onset["threshold"] for onset in method_onsets], float)
+        beats = np.array([onset["is_beat"] for onset in method_onsets], bool)
+
+        # Calculate normalized intensity - scale it relative to threshold
+        # Avoid division by very small values
+        normalized_intensity = np.divide(
+            descriptors,
+            thresholds,
+            out=np.zeros(len(SPECTRAL_METHODS)),
+            where=thresholds > 0.01,
+        )
+
+        # On beat detection, go to full brightness immediately. For non-beats,
+        # only show if intensity is above 70% of threshold, which creates more
+        # contrast between active and inactive, and quickly fade out low levels
+        spectral_levels = levels[: len(SPECTRAL_METHODS)]
+        targets = np.where(
+            beats,
+            1.0,
+            np.where(
+                normalized_intensity > 0.7,
+                np.maximum(
+                    spectral_levels, np.minimum(0.5, normalized_intensity - 0.7)
+                ),
+                spectral_levels - self.decay_rate * 2,
+            ),
+        )
+
+        # Apply decay - always fade out over time - and clamp values. Methods
+        # missing from the data only decay
+        np.clip(
+            np.where(present, targets, spectral_levels) - self.decay_rate,
+            0,
+            1.0,
+            out=spectral_levels,
+        )
 
         # Update kick and hihat with direct data (now based on spectrum energy)
+        kick = self.method_idx["kick"]
         if data["kick_detected"]:
-            self.active_levels["kick"] = 1.0  # Full brightness on detection
+            levels[kick] = 1.0  # Full brightness on detection
         else:
             # Very fast decay for kicks - they should be short and punchy
-            self.active_levels["kick"] -= self.decay_rate * 4
-            if self.active_levels["kick"] < 0:
-                self.active_levels["kick"] = 0
+            levels[kick] = max(0, levels[kick] - self.decay_rate * 4)
 
+        hihat = self.method_idx["hihat"]
         if data["hihat_detected"]:
-            self.active_levels["hihat"] = 1.0  # Full brightness on detection
+            levels[hihat] = 1.0  # Full brightness on detection
         else:
             # Extremely fast decay for hi-hats - they should be very short
-            self.active_levels["hihat"] -= self.decay_rate * 6
-            if self.active_levels["hihat"] < 0:
-                self.active_levels["hihat"] = 0
+            levels[hihat] = max(0, levels[hihat] - self.decay_rate * 6)
 
-    def draw(self, surface):
+        # Track whether any block needs repainting
+        self.changed = not np.array_equal(previous_levels, levels)
+
+    def draw_background(self, surface):
         # Draw background
         pygame.draw.rect(
             surface, (20, 20, 30), (self.x, self.y, self.width, self.height)
@@ -430,61 +498,25 @@ class OnsetDetectionVisualizer:
         )
 
         # Draw title
-        title = "Onset Detection Methods"
-        title_surface = self.font.render(title, True, (200, 200, 200))
-        surface.blit(title_surface, (self.x + 10, self.y + 10))
-
-        # Calculate dimensions for blocks
-        block_size = min(self.block_width - 10, (self.height - 80) // 2)
-        block_y = self.y + 50  # Position after title
-
-        # Draw blocks for each detection method
-        for i, method in enumerate(self.onset_methods):
-            x = self.x + i * self.block_width + (self.block_width - block_size) // 2
-
-            # Get base color for this method
-            base_color = COLORS.get(
-                method, (200, 200, 200)
-            )  # Default to light gray if not found
+        surface.blit(self.title_surface, (self.x + 10, self.y + 10))
 
-            # Calculate brightness based on activity level
-            activity = self.active_levels[method]
+        # Draw labels under the blocks
+        surface.blits(list(zip(self.label_surfaces, self.label_positions)), False)
 
-            if activity < 0.1:
-                # Almost completely black when not active (even darker than before)
-                block_color = (1, 1, 3)
-            else:
-                # Apply non-linear scaling for stronger contrast
-                activity_scaled = activity**1.5  # Power of 1.5 for contrast
-                scaled_r = int(base_color[0] * activity_scaled)
-                scaled_g = int(base_color[1] * activity_scaled)
-                scaled_b = int(base_color[2] * activity_scaled)
-                block_color = (scaled_r, scaled_g, scaled_b)
-
-            # Draw the square block
-            pygame.draw.rect(
-                surface,
-                block_color,
-                (x, block_y, block_size, block_size),
-            )
-
-            # Draw border
-            pygame.draw.rect(
-                surface, (100, 100, 120), (x, block_y, block_size, block_size), 1
-            )
+    def draw(self, surface):
+        # Bind what the loop uses to locals
+        blit = surface.blit
+        block_size = self.block_size
 
-            # Draw label
-            label = self.labels.get(method, method)
-            label_surface = pygame.font.Font(None, 18).render(
-                label, True, (150, 150, 150)
-            )
-            label_width = label_surface.get_width()
+        # Draw blocks for each detection method
+        for position, color_lut, activity in zip(
+            self.block_positions, self.color_luts, self.active_levels.tolist()
+        ):
+            # Look up the color for the activity level
+            block_color = color_lut[int(activity * 255)]
 
-            # Center the label under the block
-            surface.blit(
-                label_surface,
-                (x + (block_size - label_width) // 2, block_y + block_size + 5),
-            )
+            # Draw the square block with its border
+            blit(block_surface(block_color, block_size), position)
 
 
 # MQTT callbacks
@@ -500,19 +532,34 @@ def on_connect(client, userdata, flags, rc):
 
 def on_message(client, userdata, msg):
     """Callback for when a message is received from the broker"""
+    global latest_payload
+    latest_payload = msg.payload
+
+
+def parse_latest_payload():
+    """Parse the newest payload into latest_data, returning whether it changed"""
     global latest_data
+    global parsed_payload
+
+    payload = latest_payload
+    if payload is None or payload is parsed_payload:
+        return False
+    parsed_payload = payload
 
     try:
-        data = json.loads(msg.payload.decode())
-        latest_data = data
+        latest_data = orjson.loads(zlib.decompress(payload))
     except Exception as e:
         print(f"Error parsing message: {e}")
+        return False
+    return True
 
 
 def main():
     # Initialize Pygame
     pygame.init()
-    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    screen = pygame.display.set_mode(
+        (WIDTH, HEIGHT), pygame.DOUBLEBUF | pygame.HWSURFACE
+    )
     pygame.display.set_caption("BeatZero Spectrum Visualizer")
     clock = pygame.time.Clock()
 
@@ -551,6 +598,28 @@ def main():
     font = pygame.font.Font(None, 32)
     small_font = pygame.font.Font(None, 24)
 
+    # The background and the panels' static parts are rendered once into
+    # chrome. Only the panels and the info text change between frames, so
+    # each redraw restores those rects from chrome and pushes just them
+    visualizers = (bpm_viz, spectrum_viz, onset_viz)
+    chrome = render_chrome(visualizers)
+    screen.blit(chrome, (0, 0))
+    pygame.display.flip()
+    info_rect = pygame.Rect(WIDTH - 300, 20, 300, small_font.get_linesize())
+    panel_rects = [
+        pygame.Rect(viz.x, viz.y, viz.width, viz.height) for viz in visualizers
+    ]
+    dirty_rects = [info_rect] + panel_rects
+
+    # Beat state of the BPM panel when the panels were last drawn
+    drawn_beat = None
+
+    # Info text rendered for the newest message, and the second its clock
+    # text was formatted for
+    info_surface = None
+    info_second = None
+    timestamp = ""
+
     # Main game loop
     running = True
     while running:
@@ -562,10 +631,8 @@ def main():
                 if event.key == pygame.K_ESCAPE:
                     running = False
 
-        # Clear the screen
-        screen.fill(BACKGROUND_COLOR)
-
         # Update visualizations if new data is available
+        new_data = parse_latest_payload()
         if latest_data:
             # Update BPM visualizer
             if "tempo" in latest_data:
@@ -578,10 +645,13 @@ def main():
             # Update onset detection visualizer
             onset_viz.update(latest_data)
 
-            # Display timestamp and gain info in top right corner
-            timestamp = datetime.fromisoformat(latest_data["timestamp"]).strftime(
-                "%H:%M:%S"
-            )
+        # Render the timestamp and gain info only when the message changes,
+        # formatting the clock text only when its second changes
+        if new_data:
+            second = int(latest_data["timestamp"])
+            if second != info_second:
+                info_second = second
+                timestamp = time.strftime("%H:%M:%S", time.localtime(second))
 
             # Add gain and volume info if available
             gain_info = ""
@@ -590,18 +660,32 @@ def main():
             if "avg_volume" in latest_data:
                 gain_info += f" | Vol: {latest_data['avg_volume']:.4f}"
 
-            ts_surface = small_font.render(
+            info_surface = small_font.render(
                 f"Time: {timestamp}{gain_info}", True, (150, 150, 150)
             )
-            screen.blit(ts_surface, (WIDTH - 300, 20))
 
-        # Draw visualization elements
-        bpm_viz.draw(screen)
-        spectrum_viz.draw(screen)
-        onset_viz.draw(screen)
+        # Only redraw when a new message arrived, an onset level moved or the
+        # BPM panel blinked since the last drawn frame
+        if new_data or onset_viz.changed or bpm_viz.is_beat != drawn_beat:
+            drawn_beat = bpm_viz.is_beat
+
+            # Render the chrome again if the spectrum labels changed
+            if spectrum_viz.background_changed:
+                chrome = render_chrome(visualizers)
+
+            if info_surface:
+                # Display timestamp and gain info in top right corner
+                screen.blit(chrome, info_rect, info_rect)
+                screen.blit(info_surface, info_rect)
+
+            # Restore the panels' static parts, then draw visualization elements
+            screen.blits([(chrome, rect, rect) for rect in panel_rects], False)
+            bpm_viz.draw(screen)
+            spectrum_viz.draw(screen)
+            onset_viz.draw(screen)
 
-        # Update the display
-        pygame.display.flip()
+            # Update the display
+            pygame.display.update(dirty_rects)
 
         # Cap the frame rate
         clock.tick(FPS)
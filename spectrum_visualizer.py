@@ -1,4 +1,5 @@
-import json
+import zlib
+import orjson
 import time
 import os
 import pygame
@@ -9,6 +10,8 @@ import numpy as np
 # Window setup
 WIDTH, HEIGHT = 1024, 680  # Increased height for the BPM visualizer row
 FPS = 60  # Target 60 FPS
+IDLE_FPS = 15  # Frame rate once nothing has happened for IDLE_FRAMES frames
+IDLE_FRAMES = 30
 VSYNC = True  # Enable vertical sync for smoother rendering
 BACKGROUND_COLOR = (10, 10, 20)
 GRID_COLOR = (30, 30, 40)
@@ -33,8 +36,21 @@ COLORS = {
     "bpm": (255, 255, 255),  # White
 }
 
+# Onset methods that publish a descriptor and threshold
+SPECTRAL_METHODS = ["energy", "hfc", "complex", "phase", "specflux"]
+
+# Spectrum block colors, picked by which of the energy levels a band reaches
+SPECTRUM_LEVELS = np.array([0.3, 0.5, 0.7])
+SPECTRUM_LEVEL_COLORS = np.array(
+    [(0, 0, 0), (125, 125, 125), (175, 175, 175), (255, 255, 255)]
+)
+
 # Initialize data storage
 latest_data = None
+# Raw payload of the newest message and the last one parsed into latest_data.
+# Only the newest payload is parsed, once per frame at most
+latest_payload = None
+parsed_payload = None
 MAX_HISTORY = 200
 
 # Audio silence detection parameters
@@ -44,6 +60,35 @@ MAX_VOLUME_HISTORY = 100  # ~1 second at 100 updates/sec
 is_silent = False
 gain_multiplier = 1.0  # Gain multiplier for non-silent mode
 
+# Rendered text surfaces keyed by (font, text, color)
+_text_cache = {}
+TEXT_CACHE_SIZE = 128
+
+
+def render_cached(font, text, color):
+    """Render antialiased text, reusing the surface if it was rendered before"""
+    key = (font, text, color)
+    text_surface = _text_cache.get(key)
+    if text_surface is None:
+        if len(_text_cache) >= TEXT_CACHE_SIZE:
+            _text_cache.clear()
+        text_surface = font.render(text, True, color)
+        _text_cache[key] = text_surface
+    return text_surface
+
+
+def inner_block_rects(viz, count):
+    """Return the screen rects inside the borders of a panel's first blocks"""
+    return [
+        pygame.Rect(
+            viz.x + i * viz.block_width + (viz.block_width - viz.block_size) // 2 + 1,
+            viz.block_y + 1,
+            viz.block_size - 2,
+            viz.block_size - 2,
+        )
+        for i in range(count)
+    ]
+
 
 class SpectrumVisualizer:
     def __init__(self, x, y, width, height):
@@ -67,80 +112,75 @@ class SpectrumVisualizer:
 
         self.block_width = width // len(self.band_ranges)
 
-    def update(self, spectrum_data):
-        if "band_energy" in spectrum_data:
-            self.band_energy = spectrum_data["band_energy"]
-        if "band_ranges" in spectrum_data:
-            self.band_ranges = spectrum_data["band_ranges"]
+        # Calculate block size for frequency boxes (similar to onset detection)
+        self.block_size = min(self.block_width - 10, (self.height - 80) // 2)
+        self.block_y = self.y + 50  # Position after title
 
-    def draw(self, surface):
-        # Draw background
-        pygame.draw.rect(
-            surface, (20, 20, 30), (self.x, self.y, self.width, self.height)
-        )
-        pygame.draw.rect(
-            surface, (50, 50, 60), (self.x, self.y, self.width, self.height), 1
-        )
+        # The block interiors, filled each frame, and the background are
+        # computed once and again only if the ranges change
+        self.block_rects = inner_block_rects(self, len(self.band_ranges))
+        self.small_font = pygame.font.Font(None, 18)
+        self.background = self.render_background()
+
+    def render_background(self):
+        # Render the background, title, block borders and frequency labels
+        background = pygame.Surface((self.width, self.height)).convert()
+        background.fill((20, 20, 30))
+        pygame.draw.rect(background, (50, 50, 60), (0, 0, self.width, self.height), 1)
 
         # Draw title
         title = "Frequency Spectrum Analyzer"
         title_surface = self.font.render(title, True, (200, 200, 200))
-        surface.blit(title_surface, (self.x + 10, self.y + 10))
+        background.blit(title_surface, (10, 10))
 
-        # Calculate block size for frequency boxes (similar to onset detection)
-        block_size = min(self.block_width - 10, (self.height - 80) // 2)
-        block_y = self.y + 50  # Position after title
-
-        # Draw frequency bands as illuminated blocks (similar to onset detection)
-        for i, energy in enumerate(self.band_energy):
-            # Position the block
-            x = self.x + i * self.block_width + (self.block_width - block_size) // 2
-
-            # Get base color from gradient
-            base_color = (
-                self.color_gradient[i]
-                if i < len(self.color_gradient)
-                else (200, 200, 200)
-            )
-
-            # Determine color based on energy level
-            if energy < 0.3:
-                color = (0, 0, 0)
-            elif energy < 0.5:
-                color = (125, 125, 125)
-            elif energy < 0.7:
-                color = (175, 175, 175)
-            else:
-                color = (255, 255, 255)
-
-            # Draw the frequency block
-            pygame.draw.rect(surface, color, (x, block_y, block_size, block_size))
+        block_size = self.block_size
+        block_y = self.block_y - self.y
+        for i, (min_freq, max_freq) in enumerate(self.band_ranges):
+            x = i * self.block_width + (self.block_width - block_size) // 2
 
             # Draw border around block
             pygame.draw.rect(
-                surface, (100, 100, 120), (x, block_y, block_size, block_size), 1
+                background, (100, 100, 120), (x, block_y, block_size, block_size), 1
             )
 
             # Draw frequency label under block
-            min_freq, max_freq = (
-                self.band_ranges[i] if i < len(self.band_ranges) else (0, 0)
-            )
             if min_freq > 999:
                 label = f"{min_freq // 1000}k"
             else:
                 label = f"{min_freq}"
-
-            label_surface = pygame.font.Font(None, 18).render(
-                label, True, (150, 150, 150)
-            )
+            label_surface = self.small_font.render(label, True, (150, 150, 150))
             label_width = label_surface.get_width()
 
             # Center the label under the block
-            surface.blit(
+            background.blit(
                 label_surface,
                 (x + (block_size - label_width) // 2, block_y + block_size + 5),
             )
 
+        return background
+
+    def update(self, spectrum_data):
+        if "band_energy" in spectrum_data:
+            self.band_energy = spectrum_data["band_energy"]
+        if "band_ranges" in spectrum_data:
+            if spectrum_data["band_ranges"] != self.band_ranges:
+                self.band_ranges = spectrum_data["band_ranges"]
+                self.block_rects = inner_block_rects(self, len(self.band_ranges))
+                self.background = self.render_background()
+
+    def draw(self, surface):
+        # Draw the prerendered background, title, block borders and labels
+        surface.blit(self.background, (self.x, self.y))
+
+        # Determine every block's color from its energy level at once
+        levels = np.searchsorted(SPECTRUM_LEVELS, self.band_energy, side="right")
+        colors = SPECTRUM_LEVEL_COLORS[levels].tolist()
+
+        # Draw frequency bands as illuminated blocks inside their borders
+        fill = surface.fill
+        for block_rect, color in zip(self.block_rects, colors):
+            fill(color, block_rect)
+
 
 class BPMVisualizer:
     def __init__(self, x, y, width, height):
@@ -169,9 +209,12 @@ class BPMVisualizer:
         self.blink_rect_y = self.y + 10
         self.blink_rect_height = self.height - 20
 
-        # For debugging
-        self.frame_count = 0
-        self.last_frame_time = 0
+        # Render the static background and border once
+        self.background = pygame.Surface((self.width, self.height)).convert()
+        self.background.fill((20, 20, 30))
+        pygame.draw.rect(
+            self.background, (50, 50, 60), (0, 0, self.width, self.height), 1
+        )
 
     def update(self, bpm_data):
         current_time = pygame.time.get_ticks()
@@ -205,14 +248,6 @@ class BPMVisualizer:
         # Calculate time since last beat
         time_since_last = current_time - self.last_beat_time
 
-        # Debug frame rate
-        self.frame_count += 1
-        if current_time - self.last_frame_time > 1000:  # Every second
-            # Print frame rate for debugging
-            # print(f"FPS: {self.frame_count}, Beat interval: {self.beat_interval}ms")
-            self.frame_count = 0
-            self.last_frame_time = current_time
-
         # Check if we're due for a new beat based on the scaled BPM
         if time_since_last >= self.beat_interval:
             # Calculate how many beats we've missed (should generally be just 1)
@@ -228,17 +263,12 @@ class BPMVisualizer:
             self.is_beat = time_since_last < self.flash_duration
 
     def draw(self, surface):
-        # Draw background
-        pygame.draw.rect(
-            surface, (20, 20, 30), (self.x, self.y, self.width, self.height)
-        )
-        pygame.draw.rect(
-            surface, (50, 50, 60), (self.x, self.y, self.width, self.height), 1
-        )
+        # Draw the prerendered background and border
+        surface.blit(self.background, (self.x, self.y))
 
         # Draw BPM label showing both actual and scaled BPM
         bpm_text = f"BPM: {self.current_bpm:.1f} (Scaled: {self.scaled_bpm:.1f})"
-        bpm_label = self.font.render(bpm_text, True, (200, 200, 200))
+        bpm_label = render_cached(self.font, bpm_text, (200, 200, 200))
         surface.blit(bpm_label, (self.x + 10, self.label_y))
 
         # Draw blinking rectangle (right side of the BPM label)
@@ -310,21 +340,41 @@ class OnsetDetectionVisualizer:
         self.font = pygame.font.Font(None, 24)
 
         # Define onset methods
-        self.onset_methods = [
-            "energy",
-            "hfc",
-            "complex",
-            "phase",
-            "specflux",
-            "kick",
-            "hihat",
-        ]
+        self.onset_methods = SPECTRAL_METHODS + ["kick", "hihat"]
         self.block_width = width // len(self.onset_methods)
 
-        # Store active methods with smoothing
-        self.active_levels = {method: 0 for method in self.onset_methods}
+        # Calculate dimensions for blocks
+        self.block_size = min(self.block_width - 10, (self.height - 80) // 2)
+        self.block_y = self.y + 50  # Position after title
+
+        # Block colors for each method (in onset_methods order, defaulting to
+        # light gray) at 256 activity levels. Brightness applies non-linear
+        # scaling (power of 1.5) for stronger contrast, and blocks are almost
+        # completely black when not active (even darker than before)
+        base_colors = np.array(
+            [COLORS.get(method, (200, 200, 200)) for method in self.onset_methods]
+        )
+        activity_steps = np.arange(256) / 255
+        self.color_lut = (
+            base_colors[:, None, :] * activity_steps[None, :, None] ** 1.5
+        ).astype(int)
+        self.color_lut[:, activity_steps < 0.1] = (1, 1, 3)
+        self.method_rows = np.arange(len(self.onset_methods))
+
+        # Store active levels with smoothing, one slot per method in
+        # onset_methods order, spectral methods first
+        self.active_levels = np.zeros(len(self.onset_methods))
+        self.kick_idx = self.onset_methods.index("kick")
+        self.changed = False  # Whether the last update moved any level
+
+        # Scratch arrays for the spectral methods' values, refilled by update
+        self.present = np.zeros(len(SPECTRAL_METHODS), dtype=bool)
+        self.descriptors = np.zeros(len(SPECTRAL_METHODS))
+        self.thresholds = np.zeros(len(SPECTRAL_METHODS))
+        self.beats = np.zeros(len(SPECTRAL_METHODS), dtype=bool)
+        self.normalized_intensity = np.zeros(len(SPECTRAL_METHODS))
+        self.hihat_idx = self.onset_methods.index("hihat")
         self.decay_rate = 0.1  # Faster decay so lights go out quicker
-        self.rise_rate = 0.5  # Faster rise rate for more responsive visualization
 
         # Labels and positions
         self.labels = {
@@ -337,133 +387,130 @@ class OnsetDetectionVisualizer:
             "hihat": "Hi-hat",
         }
 
-    def update(self, data):
-        # Update onset detection methods with continuous scaling
-        for method in ["energy", "hfc", "complex", "phase", "specflux"]:
-            if method in data["onsets"]:
-                # Get the raw descriptor value and threshold
-                descriptor = data["onsets"][method]["descriptor"]
-                threshold = data["onsets"][method]["threshold"]
-                is_beat = data["onsets"][method]["is_beat"]
-
-                # Calculate normalized intensity - scale it relative to threshold
-                # Avoid division by very small values
-                if threshold > 0.01:
-                    normalized_intensity = descriptor / threshold
-                else:
-                    normalized_intensity = 0
-
-                if is_beat:
-                    # On beat detection, go to full brightness immediately
-                    self.active_levels[method] = 1.0
-                else:
-                    # For non-beats, only show if intensity is above 70% of threshold
-                    # This creates more contrast between active and inactive
-                    if normalized_intensity > 0.7:
-                        target_level = min(0.5, normalized_intensity - 0.7)
-                        self.active_levels[method] = max(
-                            self.active_levels[method], target_level
-                        )
-                    else:
-                        # Quickly fade out low levels
-                        self.active_levels[method] -= self.decay_rate * 2
-
-                # Apply decay - always fade out over time
-                self.active_levels[method] -= self.decay_rate
-
-                # Clamp values
-                self.active_levels[method] = max(
-                    0, min(1.0, self.active_levels[method])
-                )
-            else:
-                # Decay activity
-                self.active_levels[method] -= self.decay_rate
-                if self.active_levels[method] < 0:
-                    self.active_levels[method] = 0
+        # Screen rects inside each block's border, filled every frame
+        self.block_rects = inner_block_rects(self, len(self.onset_methods))
+        self.background = self.render_background()
 
-        # Update kick and hihat with direct data (now based on spectrum energy)
-        if data["kick_detected"]:
-            self.active_levels["kick"] = 1.0  # Full brightness on detection
-        else:
-            # Very fast decay for kicks - they should be short and punchy
-            self.active_levels["kick"] -= self.decay_rate * 4
-            if self.active_levels["kick"] < 0:
-                self.active_levels["kick"] = 0
-
-        if data["hihat_detected"]:
-            self.active_levels["hihat"] = 1.0  # Full brightness on detection
-        else:
-            # Extremely fast decay for hi-hats - they should be very short
-            self.active_levels["hihat"] -= self.decay_rate * 6
-            if self.active_levels["hihat"] < 0:
-                self.active_levels["hihat"] = 0
-
-    def draw(self, surface):
-        # Draw background
-        pygame.draw.rect(
-            surface, (20, 20, 30), (self.x, self.y, self.width, self.height)
-        )
-        pygame.draw.rect(
-            surface, (50, 50, 60), (self.x, self.y, self.width, self.height), 1
-        )
+    def render_background(self):
+        # Render the static background, title, block borders and labels once
+        background = pygame.Surface((self.width, self.height)).convert()
+        background.fill((20, 20, 30))
+        pygame.draw.rect(background, (50, 50, 60), (0, 0, self.width, self.height), 1)
 
         # Draw title
         title = "Onset Detection Methods"
         title_surface = self.font.render(title, True, (200, 200, 200))
-        surface.blit(title_surface, (self.x + 10, self.y + 10))
-
-        # Calculate dimensions for blocks
-        block_size = min(self.block_width - 10, (self.height - 80) // 2)
-        block_y = self.y + 50  # Position after title
+        background.blit(title_surface, (10, 10))
 
-        # Draw blocks for each detection method
+        small_font = pygame.font.Font(None, 18)
+        block_size = self.block_size
+        block_y = self.block_y - self.y
         for i, method in enumerate(self.onset_methods):
-            x = self.x + i * self.block_width + (self.block_width - block_size) // 2
-
-            # Get base color for this method
-            base_color = COLORS.get(
-                method, (200, 200, 200)
-            )  # Default to light gray if not found
-
-            # Calculate brightness based on activity level
-            activity = self.active_levels[method]
-
-            if activity < 0.1:
-                # Almost completely black when not active (even darker than before)
-                block_color = (1, 1, 3)
-            else:
-                # Apply non-linear scaling for stronger contrast
-                activity_scaled = activity**1.5  # Power of 1.5 for contrast
-                scaled_r = int(base_color[0] * activity_scaled)
-                scaled_g = int(base_color[1] * activity_scaled)
-                scaled_b = int(base_color[2] * activity_scaled)
-                block_color = (scaled_r, scaled_g, scaled_b)
-
-            # Draw the square block
-            pygame.draw.rect(
-                surface,
-                block_color,
-                (x, block_y, block_size, block_size),
-            )
+            x = i * self.block_width + (self.block_width - block_size) // 2
 
             # Draw border
             pygame.draw.rect(
-                surface, (100, 100, 120), (x, block_y, block_size, block_size), 1
+                background, (100, 100, 120), (x, block_y, block_size, block_size), 1
             )
 
             # Draw label
             label = self.labels.get(method, method)
-            label_surface = pygame.font.Font(None, 18).render(
-                label, True, (150, 150, 150)
-            )
+            label_surface = small_font.render(label, True, (150, 150, 150))
             label_width = label_surface.get_width()
 
             # Center the label under the block
-            surface.blit(
+            background.blit(
                 label_surface,
                 (x + (block_size - label_width) // 2, block_y + block_size + 5),
             )
 
+        return background
+
+    def update(self, data):
+        previous_levels = self.active_levels.copy()
+
+        # Gather the spectral methods' values, marking methods missing from data
+        present = self.present
+        descriptors = self.descriptors
+        thresholds = self.thresholds
+        beats = self.beats
+        onsets = data["onsets"]
+        for i, method in enumerate(SPECTRAL_METHODS):
+            onset = onsets.get(method)
+            if onset is None:
+                present[i] = False
+                descriptors[i] = 0.0
+                thresholds[i] = 0.0
+                beats[i] = False
+            else:
+                present[i] = True
+                descriptors[i] = onset["descriptor"]
+                thresholds[i] = onset["threshold"]
+                beats[i] = onset["is_beat"]
+
+        # Calculate normalized intensity - scale it relative to threshold
+        # Avoid division by very small values
+        normalized_intensity = self.normalized_intensity
+        normalized_intensity.fill(0.0)
+        np.divide(
+            descriptors,
+            thresholds,
+            out=normalized_intensity,
+            where=thresholds > 0.01,
+        )
+
+        # On beat detection, go to full brightness immediately. For non-beats,
+        # only show if intensity is above 70% of threshold, which creates more
+        # contrast between active and inactive, and quickly fade out low levels
+        levels = self.active_levels[: len(SPECTRAL_METHODS)]
+        target_levels = np.where(
+            beats,
+            1.0,
+            np.where(
+                normalized_intensity > 0.7,
+                np.maximum(levels, np.minimum(0.5, normalized_intensity - 0.7)),
+                levels - self.decay_rate * 2,
+            ),
+        )
+
+        # Apply decay - always fade out over time - and clamp values. Methods
+        # missing from the data only decay
+        levels[:] = np.where(present, target_levels, levels) - self.decay_rate
+        np.clip(levels, 0, 1.0, out=levels)
+
+        # Update kick and hihat with direct data (now based on spectrum energy)
+        if data["kick_detected"]:
+            self.active_levels[self.kick_idx] = 1.0  # Full brightness on detection
+        else:
+            # Very fast decay for kicks - they should be short and punchy
+            self.active_levels[self.kick_idx] = max(
+                0, self.active_levels[self.kick_idx] - self.decay_rate * 4
+            )
+
+        if data["hihat_detected"]:
+            self.active_levels[self.hihat_idx] = 1.0  # Full brightness on detection
+        else:
+            # Extremely fast decay for hi-hats - they should be very short
+            self.active_levels[self.hihat_idx] = max(
+                0, self.active_levels[self.hihat_idx] - self.decay_rate * 6
+            )
+
+        # Track whether any block needs repainting
+        self.changed = not np.array_equal(previous_levels, self.active_levels)
+
+    def draw(self, surface):
+        # Draw the prerendered background, title, block borders and labels
+        surface.blit(self.background, (self.x, self.y))
+
+        # Look up each block's color by its activity level at 8-bit resolution
+        steps = (self.active_levels * 255).astype(int)
+        block_colors = self.color_lut[self.method_rows, steps].tolist()
+
+        # Draw blocks for each detection method inside their borders
+        fill = surface.fill
+        for block_rect, block_color in zip(self.block_rects, block_colors):
+            fill(block_color, block_rect)
+
 
 # MQTT callbacks
 def on_connect(client, userdata, flags, rc):
@@ -478,19 +525,38 @@ def on_connect(client, userdata, flags, rc):
 
 def on_message(client, userdata, msg):
     """Callback for when a message is received from the broker"""
+    global latest_payload
+    latest_payload = msg.payload
+
+
+def parse_latest_payload():
+    """Parse the newest payload into latest_data, returning whether it changed"""
     global latest_data
+    global parsed_payload
+
+    payload = latest_payload
+    if payload is None or payload is parsed_payload:
+        return False
+    parsed_payload = payload
 
     try:
-        data = json.loads(msg.payload.decode())
-        latest_data = data
+        latest_data = orjson.loads(zlib.decompress(payload))
     except Exception as e:
         print(f"Error parsing message: {e}")
+        return False
+    return True
 
 
 def main():
+    # Ask for double rather than triple buffering, which saves a frame of
+    # latency on backends that honor the hint (KMSDRM, Raspberry Pi)
+    os.environ.setdefault("SDL_VIDEO_DOUBLE_BUFFER", "1")
+
     # Initialize Pygame
     pygame.init()
-    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    screen = pygame.display.set_mode(
+        (WIDTH, HEIGHT), pygame.DOUBLEBUF | pygame.HWSURFACE
+    )
     pygame.display.set_caption("BeatZero Spectrum Visualizer")
     clock = pygame.time.Clock()
 
@@ -529,21 +595,41 @@ def main():
     font = pygame.font.Font(None, 32)
     small_font = pygame.font.Font(None, 24)
 
+    # Only the panels and the info text change between frames, so the
+    # background is filled once and each frame pushes just those rects
+    screen.fill(BACKGROUND_COLOR)
+    pygame.display.flip()
+    info_rect = pygame.Rect(WIDTH - 300, 20, 300, small_font.get_linesize())
+    dirty_rects = [info_rect] + [
+        pygame.Rect(viz.x, viz.y, viz.width, viz.height)
+        for viz in (bpm_viz, spectrum_viz, onset_viz)
+    ]
+
+    # Beat state of the BPM panel when the panels were last drawn
+    drawn_beat = None
+    info_text = ""
+
+    # Consecutive frames without new data or visible onset activity
+    idle_frames = 0
+
+    # Bind the per-frame pygame calls to locals
+    get_events = pygame.event.get
+    update_display = pygame.display.update
+    tick = clock.tick
+
     # Main game loop
     running = True
     while running:
         # Process events
-        for event in pygame.event.get():
+        for event in get_events():
             if event.type == pygame.QUIT:
                 running = False
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE:
                     running = False
 
-        # Clear the screen
-        screen.fill(BACKGROUND_COLOR)
-
         # Update visualizations if new data is available
+        new_data = parse_latest_payload()
         if latest_data:
             # Update BPM visualizer
             if "tempo" in latest_data:
@@ -556,8 +642,9 @@ def main():
             # Update onset detection visualizer
             onset_viz.update(latest_data)
 
-            # Display timestamp and gain info in top right corner
-            timestamp = datetime.fromisoformat(latest_data["timestamp"]).strftime(
+        # Format the timestamp and gain info only when the message changes
+        if new_data:
+            timestamp = datetime.fromtimestamp(latest_data["timestamp"]).strftime(
                 "%H:%M:%S"
             )
 
@@ -568,21 +655,34 @@ def main():
             if "avg_volume" in latest_data:
                 gain_info += f" | Vol: {latest_data['avg_volume']:.4f}"
 
-            ts_surface = small_font.render(
-                f"Time: {timestamp}{gain_info}", True, (150, 150, 150)
-            )
-            screen.blit(ts_surface, (WIDTH - 300, 20))
+            info_text = f"Time: {timestamp}{gain_info}"
 
-        # Draw visualization elements
-        bpm_viz.draw(screen)
-        spectrum_viz.draw(screen)
-        onset_viz.draw(screen)
+        # Only redraw when a new message arrived, an onset level moved or the
+        # BPM panel blinked since the last drawn frame
+        if new_data or onset_viz.changed or bpm_viz.is_beat != drawn_beat:
+            drawn_beat = bpm_viz.is_beat
 
-        # Update the display
-        pygame.display.flip()
+            if info_text:
+                # Display timestamp and gain info in top right corner
+                ts_surface = render_cached(small_font, info_text, (150, 150, 150))
+                screen.fill(BACKGROUND_COLOR, info_rect)
+                screen.blit(ts_surface, info_rect)
 
-        # Cap the frame rate
-        clock.tick(FPS)
+            # Draw visualization elements
+            bpm_viz.draw(screen)
+            spectrum_viz.draw(screen)
+            onset_viz.draw(screen)
+
+            # Update the display
+            update_display(dirty_rects)
+
+        # Cap the frame rate, dropping to IDLE_FPS while nothing is happening
+        # and returning to full rate on the first active frame
+        if new_data or onset_viz.active_levels.max() >= 0.01:
+            idle_frames = 0
+        else:
+            idle_frames += 1
+        tick(FPS if idle_frames < IDLE_FRAMES else IDLE_FPS)
 
     # Clean up
     client.loop_stop()
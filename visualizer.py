@@ -1,9 +1,10 @@
 import pygame
 import time
-import json
+import orjson
 import os
+import array
+from collections import deque
 import paho.mqtt.client as mqtt
-from datetime import datetime
 
 # Window setup
 WIDTH, HEIGHT = 600, 450  # Increased height to accommodate pitch visualizer
@@ -19,13 +20,55 @@ MQTT_CLIENT_ID = f"beatzero-visualizer-{int(time.time())}"
 # Global variable to store latest data from MQTT
 latest_data = None
 
+# Newest raw payload from the MQTT thread and the payload last parsed
+latest_payload = None
+parsed_payload = None
+
+# Event that wakes the main loop when a payload arrives, posted at most
+# once until the main loop next parses
+DATA_EVENT = pygame.USEREVENT
+data_event_posted = False
+
+# Rendered text surfaces keyed by (font, text, color)
+_text_cache = {}
+TEXT_CACHE_SIZE = 128
+
+
+def render_cached(font, text, color):
+    """Render antialiased text, reusing the surface if it was rendered before"""
+    key = (font, text, color)
+    text_surface = _text_cache.get(key)
+    if text_surface is None:
+        if len(_text_cache) >= TEXT_CACHE_SIZE:
+            _text_cache.clear()
+        text_surface = font.render(text, True, color)
+        _text_cache[key] = text_surface
+    return text_surface
+
+
+# Solid box surfaces keyed by (color, size, border color)
+_box_cache = {}
+
+
+def box_surface(color, size, border=None):
+    """Return a display-format box of one color, with an optional 1px border"""
+    key = (color, size, border)
+    box = _box_cache.get(key)
+    if box is None:
+        box = pygame.Surface(size).convert()
+        box.fill(color)
+        if border is not None:
+            pygame.draw.rect(box, border, box.get_rect(), 1)
+        _box_cache[key] = box
+    return box
+
 
 # MQTT callbacks
 def on_connect(client, userdata, flags, rc, properties=None):
     """Callback for when the client connects to the broker"""
     if rc == 0:
         print(f"Connected to MQTT broker at {MQTT_BROKER}")
-        client.subscribe(MQTT_TOPIC)
+        client.subscribe(MQTT_TOPIC, qos=0)
         print(f"Subscribed to topic: {MQTT_TOPIC}")
     else:
         print(f"Failed to connect to MQTT broker with code: {rc}")
@@ -33,14 +76,40 @@ def on_connect(client, userdata, flags, rc, properties=None):
 
 def on_message(client, userdata, msg):
     """Callback for when a message is received from the broker"""
+    global latest_payload
+    global data_event_posted
+    latest_payload = msg.payload
+    if not data_event_posted:
+        data_event_posted = True
+        pygame.event.post(pygame.event.Event(DATA_EVENT))
+
+
+def parse_latest_payload():
+    """Parse the newest payload into latest_data, returning whether it changed"""
     global latest_data
+    global parsed_payload
+    global data_event_posted
+
+    data_event_posted = False
+    payload = latest_payload
+    if payload is None or payload is parsed_payload:
+        return False
+    parsed_payload = payload
+
     try:
-        latest_data = json.loads(msg.payload.decode())
-    except Exception as e:
+        latest_data = orjson.loads(payload)
+    except orjson.JSONDecodeError as e:
         print(f"Error parsing message: {e}")
+        return False
+    return True
 
 
 class OnsetDetector:
+    __slots__ = ("label", "active_time", "detector_name")
+
+    # How long the indicator box stays lit after an onset, in ms
+    active_duration = 60
+
     def __init__(self, label):
         self.label = label
 
@@ -58,37 +127,51 @@ class OnsetDetector:
     def activate(self, current_time):
         self.active_time = current_time
 
-    def render(self, surface, font, x, y, width, current_time):
-        """Draw the detector at the given coordinates"""
-        # Draw label
-        label_surface = font.render(self.label, True, (200, 200, 200))
+    def is_active(self, current_time):
+        """Whether the indicator box is lit at the given time"""
+        return current_time - self.active_time < self.active_duration
+
+    def render_background(self, surface, font, x, y):
+        """Draw the detector's static label at the given coordinates"""
+        label_surface = render_cached(font, self.label, (200, 200, 200))
         surface.blit(label_surface, (x, y))
 
+    def render(self, surface, x, y, width, current_time):
+        """Draw the detector's indicator box at the given coordinates"""
         # Calculate color based on intensity
-        active = current_time - self.active_time < 60
-        if active:
+        if self.is_active(current_time):
             box_color = (200, 200, 200)
         else:
             box_color = (10, 10, 20)  # Dark gray when inactive
 
-        # Draw indicator box
+        # Draw bordered indicator box
         box_x = x + width - 30
         box_y = y
         box_size = 20
 
-        pygame.draw.rect(surface, box_color, (box_x, box_y, box_size, box_size))
-
-        # Add border to box
-        pygame.draw.rect(
-            surface, (100, 100, 120), (box_x, box_y, box_size, box_size), 1
+        surface.blit(
+            box_surface(box_color, (box_size, box_size), (100, 100, 120)),
+            (box_x, box_y),
         )
-        self.active = False
 
 
 class NoteVisualizer:
+    __slots__ = (
+        "pitch_class_times",
+        "activation_duration",
+        "note_names",
+        "box_width",
+        "box_height",
+        "box_spacing",
+        "active_box",
+        "inactive_box",
+        "layout",
+        "box_positions",
+    )
+
     def __init__(self):
-        # Store the 12 pitch classes with their activation times
-        self.active_pitch_classes = {}  # {pitch_class (0-11): activation_time}
+        # Activation time of each of the 12 pitch classes, far in the past until played
+        self.pitch_class_times = array.array("q", [-(10**9)] * 12)
         self.activation_duration = 200
         self.note_names = [
             "C",
@@ -105,21 +188,44 @@ class NoteVisualizer:
             "B",
         ]
 
-    def update(self, notes):
+        # Use fixed box dimensions
+        self.box_width = 30  # Fixed width for each box
+        self.box_height = 25
+        self.box_spacing = 5  # Space between boxes
+
+        # Boxes for active and inactive pitch classes, all drawn in one call
+        box_size = (self.box_width, self.box_height)
+        self.active_box = box_surface((255, 255, 255), box_size)  # White
+        self.inactive_box = box_surface((40, 40, 50), box_size)  # Dark gray
+
+        # Box positions, computed for the last (x, y, width) rendered at
+        self.layout = None
+        self.box_positions = []
+
+    def update(self, notes, current_time):
         # Add current time for each note, mapped to pitch class (0-11)
-        current_time = pygame.time.get_ticks()
         for note in notes:
             # Convert MIDI note to pitch class (C=0, C#=1, ..., B=11)
             pitch_class = int(note) % 12
-            self.active_pitch_classes[pitch_class] = current_time
-
-    def render(self, surface, font, x, y, width, height):
-        """Draw the note visualizer - 12 boxes for the 12 pitch classes"""
-        # Get current time to check which notes are still active
-        current_time = pygame.time.get_ticks()
-
+            self.pitch_class_times[pitch_class] = current_time
+
+    def active_flags(self, current_time):
+        """Whether each of the 12 pitch classes is lit at the given time"""
+        oldest_active = current_time - self.activation_duration
+        return tuple(timestamp >= oldest_active for timestamp in self.pitch_class_times)
+
+    def next_change(self, current_time):
+        """Time at which the next lit box goes dark, or None if none are lit"""
+        oldest_active = current_time - self.activation_duration
+        lit_times = [t for t in self.pitch_class_times if t >= oldest_active]
+        if not lit_times:
+            return None
+        return min(lit_times) + self.activation_duration + 1
+
+    def render_background(self, surface, font, x, y, width):
+        """Draw the note visualizer's static title and panel"""
         # Draw section title
-        title_surface = font.render("Notes", True, (200, 200, 200))
+        title_surface = render_cached(font, "Notes", (200, 200, 200))
         surface.blit(title_surface, (x, y))
 
         # Draw background
@@ -128,63 +234,87 @@ class NoteVisualizer:
         pygame.draw.rect(surface, (20, 20, 30), (x, panel_y, width, panel_height))
         pygame.draw.rect(surface, (50, 50, 60), (x, panel_y, width, panel_height), 1)
 
-        # Remove pitch classes that have been visible for longer than activation_duration
-        pitch_classes_to_remove = []
-        for pitch_class, timestamp in self.active_pitch_classes.items():
-            if current_time - timestamp > self.activation_duration:
-                pitch_classes_to_remove.append(pitch_class)
-
-        for pitch_class in pitch_classes_to_remove:
-            self.active_pitch_classes.pop(pitch_class)
-
-        # Use fixed box dimensions
-        box_width = 30  # Fixed width for each box
-        box_height = 25
-        box_spacing = 5  # Space between boxes
-
-        # Calculate total width needed for all boxes
-        total_boxes_width = (box_width * 12) + (box_spacing * 11)
-
-        # Calculate starting x to center all boxes in the panel
-        start_x = x + ((width - total_boxes_width) // 2)
-        box_y = panel_y + 7
-
-        # Draw all 12 pitch class boxes
-        for pitch_class in range(12):
-            box_x = start_x + (pitch_class * (box_width + box_spacing))
-
-            # Check if this pitch class is active
-            is_active = pitch_class in self.active_pitch_classes
-
-            # Set box color based on activity
-            if is_active:
-                box_color = (255, 255, 255)  # White when active
-            else:
-                box_color = (40, 40, 50)  # Dark gray when inactive
+    def render(self, surface, x, y, width, current_time):
+        """Draw the note visualizer - 12 boxes for the 12 pitch classes"""
+        panel_y = y + 30
 
-            # Draw the box
-            pygame.draw.rect(surface, box_color, (box_x, box_y, box_width, box_height))
+        if (x, y, width) != self.layout:
+            self.layout = (x, y, width)
+
+            # Calculate total width needed for all boxes
+            total_boxes_width = (self.box_width * 12) + (self.box_spacing * 11)
+
+            # Calculate starting x to center all boxes in the panel
+            start_x = x + ((width - total_boxes_width) // 2)
+            box_y = panel_y + 7
+            self.box_positions = [
+                (start_x + pitch_class * (self.box_width + self.box_spacing), box_y)
+                for pitch_class in range(12)
+            ]
+
+        # Draw all 12 pitch class boxes, lit if played within activation_duration
+        active_box = self.active_box
+        inactive_box = self.inactive_box
+        surface.blits(
+            [
+                (active_box if active else inactive_box, pos)
+                for active, pos in zip(
+                    self.active_flags(current_time), self.box_positions
+                )
+            ],
+            False,
+        )
 
 
 class PitchVisualizer:
+    __slots__ = (
+        "active_pitches",
+        "min_pitch",
+        "max_pitch",
+        "fade_duration",
+        "rect_width",
+        "rect_height",
+        "fade_boxes",
+        "layout",
+        "box_x_by_hz",
+    )
+
     def __init__(self):
-        # Store pitches with their activation times
-        self.active_pitches = {}  # {pitch_value: activation_time}
+        # Store pitches with their activation times, oldest first
+        self.active_pitches = deque()  # (pitch_value, activation_time)
         self.min_pitch = 50  # Min frequency in Hz - widened to prevent low-end clipping
         self.max_pitch = (
             500  # Max frequency in Hz - widened to prevent high-end clipping
         )
         self.fade_duration = 350  # Fade out duration in ms
 
+        # Faded box for every millisecond since activation
+        self.rect_width = 10
+        self.rect_height = 20
+        self.fade_boxes = [
+            box_surface((brightness, brightness, brightness), (10, 20))
+            for brightness in (
+                int(255 * (1.0 - time_elapsed / self.fade_duration))
+                for time_elapsed in range(self.fade_duration)
+            )
+        ]
+
+        # Box x position for every whole Hz in range, computed for the last
+        # (x, width) rendered at
+        self.layout = None
+        self.box_x_by_hz = None
+
     def activate(self, pitch, confidence, current_time):
         if confidence > 0.2 and pitch > 0:
-            # Add current pitch with its activation time
-            self.active_pitches[pitch] = current_time
+            # Add current pitch with its activation time, refreshing a repeat
+            if self.active_pitches and self.active_pitches[-1][0] == pitch:
+                self.active_pitches.pop()
+            self.active_pitches.append((pitch, current_time))
 
-    def render(self, surface, font, x, y, width, current_time):
-        """Draw the pitch visualizer with boxes that fade out over time"""
+    def render_background(self, surface, font, x, y, width):
+        """Draw the pitch visualizer's static label and panel"""
         # Draw label
-        label_surface = font.render("Pitch", True, (200, 200, 200))
+        label_surface = render_cached(font, "Pitch", (200, 200, 200))
         surface.blit(label_surface, (x, y))
 
         # Draw background panel
@@ -193,54 +323,68 @@ class PitchVisualizer:
         pygame.draw.rect(surface, (20, 20, 30), (x, panel_y, width, panel_height))
         pygame.draw.rect(surface, (50, 50, 60), (x, panel_y, width, panel_height), 1)
 
-        # Find pitches that have expired and should be removed
-        pitches_to_remove = []
-        for pitch, activation_time in self.active_pitches.items():
-            # Check if this pitch's fade duration has expired
-            if current_time - activation_time >= self.fade_duration:
-                pitches_to_remove.append(pitch)
-
-        # Remove expired pitches
-        for pitch in pitches_to_remove:
-            self.active_pitches.pop(pitch)
+    def render(self, surface, x, y, width, current_time):
+        """Draw the pitch visualizer with boxes that fade out over time"""
+        panel_y = y + 30
+        panel_height = 30
 
-        # Draw all active pitches directly
-        for pitch, activation_time in self.active_pitches.items():
-            # Calculate fade factor based on time
-            time_elapsed = current_time - activation_time
-            fade_factor = 1.0 - (time_elapsed / self.fade_duration)
+        # Drop pitches whose fade duration has expired from the old end
+        active_pitches = self.active_pitches
+        while (
+            active_pitches and current_time - active_pitches[0][1] >= self.fade_duration
+        ):
+            active_pitches.popleft()
 
-            # Clip pitch to our range
-            clipped_pitch = max(self.min_pitch, min(self.max_pitch, pitch))
+        if (x, width) != self.layout:
+            self.layout = (x, width)
 
-            # Map pitch to exact pixel position in the visualization area
+            # Map each pitch to its box position in the visualization area
             usable_width = width - 20  # 10px padding on each side
-            position_ratio = (clipped_pitch - self.min_pitch) / (
-                self.max_pitch - self.min_pitch
-            )
-            center_x = int(x + 10 + (position_ratio * usable_width))
-
-            # Set up the rectangle dimensions
-            rect_width = 10  # Fixed 20px width
-            rect_height = 20  # Fixed 20px height
-            rect_y = panel_y + (panel_height - rect_height) // 2  # Center vertically
-
-            # Calculate color with fade effect
-            brightness = int(255 * fade_factor)
-            rect_color = (brightness, brightness, brightness)
-
-            # Draw the rectangle centered on the pitch position
-            pygame.draw.rect(
-                surface,
-                rect_color,
-                (center_x - rect_width // 2, rect_y, rect_width, rect_height),
+            pitch_range = self.max_pitch - self.min_pitch
+            self.box_x_by_hz = array.array(
+                "h",
+                [
+                    int(x + 10 + (hz / pitch_range) * usable_width)
+                    - self.rect_width // 2
+                    for hz in range(pitch_range + 1)
+                ],
             )
 
+        rect_y = panel_y + (panel_height - self.rect_height) // 2  # Center vertically
+        min_pitch = self.min_pitch
+        max_pitch = self.max_pitch
+        box_x_by_hz = self.box_x_by_hz
+        fade_boxes = self.fade_boxes
+
+        # Collect active pitches newest first, skipping any box that a newer
+        # pitch at the same position (such as a clipped one) would cover
+        boxes = []
+        drawn_x = set()
+        for pitch, activation_time in reversed(active_pitches):
+            # Clip pitch to our range and look up its box position
+            box_x = box_x_by_hz[int(max(min_pitch, min(max_pitch, pitch))) - min_pitch]
+            if box_x in drawn_x:
+                continue
+            drawn_x.add(box_x)
+
+            # Pick the box faded by the time since activation
+            boxes.append((fade_boxes[current_time - activation_time], (box_x, rect_y)))
+
+        # Draw oldest first so newer pitches stay on top
+        boxes.reverse()
+        surface.blits(boxes, False)
+
 
 def main():
+    # Ask for double rather than triple buffering, which saves a frame of
+    # latency on backends that honor the hint (KMSDRM, Raspberry Pi)
+    os.environ.setdefault("SDL_VIDEO_DOUBLE_BUFFER", "1")
+
     # Initialize Pygame
     pygame.init()
-    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    screen = pygame.display.set_mode(
+        (WIDTH, HEIGHT), pygame.DOUBLEBUF | pygame.HWSURFACE
+    )
     pygame.display.set_caption("BeatZero Visualizer")
     clock = pygame.time.Clock()
 
@@ -269,6 +413,7 @@ def main():
     # BPM blinker configuration
     blink_state = False  # Start with blinker off
     next_transition_time = 0
+    ms_per_transition = 60000 / bpm / 2  # Half-beat for on->off or off->on
 
     # Initialize onset detectors with different colors
     onset_detectors = {
@@ -288,6 +433,88 @@ def main():
     # Initialize pitch visualizer
     pitch_viz = PitchVisualizer()
 
+    # Lay out the onset detectors in two columns
+    title_y = 60
+    detector_y = title_y + 30
+    detector_height = 25
+    col_width = WIDTH // 2
+
+    # Define column layout
+    left_col = [
+        # "energy",
+        "complex",
+        "specflux",
+        "wphase",
+    ]
+    right_col = ["hfc", "phase", "mkl", "kl"]
+
+    # Note visualizer in the bottom part of the screen, pitch visualizer below
+    note_viz_y = detector_y + max(len(left_col), len(right_col)) * detector_height + 20
+    pitch_viz_y = note_viz_y + 100
+
+    # Volume bar as a single horizontal bar
+    volume_bar_width = 200  # 200px total width
+    volume_bar_height = 20
+    volume_bar_x = 190
+    volume_bar_y = 17
+
+    # Full white bar, of which the filled portion is blitted each frame
+    volume_bar_full = box_surface(
+        (255, 255, 255), (volume_bar_width, volume_bar_height)
+    )
+
+    # Render everything that never changes into one background surface
+    background = pygame.Surface((WIDTH, HEIGHT)).convert()
+    background.fill(BACKGROUND_COLOR)
+
+    # Volume label and empty bar
+    background.blit(render_cached(font, "Volume", (255, 255, 255)), (120, 20))
+    pygame.draw.rect(
+        background,
+        (50, 50, 70),  # Dark gray background
+        (volume_bar_x, volume_bar_y, volume_bar_width, volume_bar_height),
+    )
+
+    # Onset detectors section title and detector labels
+    onset_title = render_cached(font, "Onset Detectors", (200, 200, 200))
+    background.blit(onset_title, (20, title_y))
+    for i, key in enumerate(left_col):
+        y_pos = detector_y + i * detector_height
+        onset_detectors[key].render_background(background, small_font, 40, y_pos)
+    for i, key in enumerate(right_col):
+        y_pos = detector_y + i * detector_height
+        onset_detectors[key].render_background(
+            background, small_font, col_width + 40, y_pos
+        )
+
+    # Detector placements, precomputed once for the draw loop
+    detector_layout = [
+        (onset_detectors[key], 40, detector_y + i * detector_height)
+        for i, key in enumerate(left_col)
+    ] + [
+        (onset_detectors[key], col_width + 40, detector_y + i * detector_height)
+        for i, key in enumerate(right_col)
+    ]
+
+    # Note and pitch titles and panels
+    note_viz.render_background(background, font, 40, note_viz_y, WIDTH - 80)
+    pitch_viz.render_background(background, font, 40, pitch_viz_y, WIDTH - 80)
+
+    # Regions that change between frames: BPM, blinker and volume bar, the
+    # detector boxes, the note boxes, the pitch panel and the status line
+    dirty_rects = [
+        pygame.Rect(0, 0, WIDTH, title_y),
+        pygame.Rect(0, detector_y, WIDTH, note_viz_y - detector_y),
+        pygame.Rect(40, note_viz_y + 30, WIDTH - 80, 40),
+        pygame.Rect(40, pitch_viz_y + 30, WIDTH - 80, 30),
+        pygame.Rect(0, HEIGHT - 30, WIDTH, 30),
+    ]
+    screen.blit(background, (0, 0))
+    pygame.display.flip()
+
+    # Everything visible outside the pitch panel when the screen was last drawn
+    drawn_state = None
+
     # Main game loop
     running = True
     while running:
@@ -302,11 +529,15 @@ def main():
                     running = False
 
         # Update data if new MQTT message received
-        if latest_data:
+        if parse_latest_payload():
             # Update BPM from MQTT data
             if "bpm" in latest_data:
                 bpm = latest_data["bpm"]
 
+                # Keep blinking at the last tempo while the broker reports none
+                if bpm > 0:
+                    ms_per_transition = 60000 / bpm / 2
+
             # Update onset detectors from MQTT data
             for method in onset_detectors:
                 if method in latest_data and latest_data[method]:
@@ -319,7 +550,7 @@ def main():
             # Update note visualizer from MQTT data
             if "notes" in latest_data:
                 notes = latest_data["notes"]
-                note_viz.update(notes)
+                note_viz.update(notes, current_time)
 
             # Update pitch visualizer from MQTT data
             if "pitch" in latest_data:
@@ -332,110 +563,94 @@ def main():
 
         # Check if it's time for a blink transition
         if current_time >= next_transition_time:
-            ms_per_beat = 60000 / bpm  # Convert BPM to milliseconds
-            ms_per_transition = ms_per_beat / 2  # Half-beat for on->off or off->on
             # Toggle blink state
             blink_state = not blink_state
 
             # Set next transition time
             next_transition_time = current_time + ms_per_transition
 
-        # Clear the screen
-        screen.fill(BACKGROUND_COLOR)
-
-        # Draw BPM blinker in top left - showing as integer
-        bpm_text = font.render(f"BPM {int(bpm)}", True, (255, 255, 255))
-        screen.blit(bpm_text, (20, 20))
-
-        # Draw blinking box
-        if blink_state:
-            blink_color = (255, 255, 255)  # White when on
-        else:
-            blink_color = (50, 50, 70)  # Dark gray when off
-
-        pygame.draw.rect(screen, blink_color, (90, 17, 20, 20))
-
-        # Draw Volume indicator
-        vol_text = font.render("Volume", True, (255, 255, 255))
-        screen.blit(vol_text, (120, 20))
+        # Skip drawing when nothing visible has changed since the last frame;
+        # fading pitches change every frame while any are on screen
+        filled_width = int(volume * volume_bar_width)
+        frame_state = (
+            int(bpm),
+            blink_state,
+            filled_width,
+            tuple(
+                detector.is_active(current_time) for detector, _, _ in detector_layout
+            ),
+            note_viz.active_flags(current_time),
+            bool(latest_data),
+        )
+        if frame_state != drawn_state or pitch_viz.active_pitches:
+            drawn_state = frame_state
 
-        # Draw volume as a single horizontal bar
-        volume_bar_width = 200  # 200px total width
-        volume_bar_height = 20
-        volume_bar_x = 190
-        volume_bar_y = 17
+            # Restore the static background under the changing regions
+            for rect in dirty_rects:
+                screen.blit(background, rect, rect)
 
-        # Draw background volume bar (empty)
-        pygame.draw.rect(
-            screen,
-            (50, 50, 70),  # Dark gray background
-            (volume_bar_x, volume_bar_y, volume_bar_width, volume_bar_height),
-        )
+            # Draw BPM blinker in top left - showing as integer
+            bpm_text = render_cached(font, f"BPM {int(bpm)}", (255, 255, 255))
+            screen.blit(bpm_text, (20, 20))
 
-        # Draw filled portion based on volume (0-1 directly maps to 0-200px)
-        filled_width = int(volume * volume_bar_width)
-        if filled_width > 0:
-            pygame.draw.rect(
-                screen,
-                (255, 255, 255),  # White for filled portion
-                (volume_bar_x, volume_bar_y, filled_width, volume_bar_height),
-            )
+            # Draw blinking box
+            if blink_state:
+                blink_color = (255, 255, 255)  # White when on
+            else:
+                blink_color = (50, 50, 70)  # Dark gray when off
 
-        # Draw onset detectors section title
-        title_y = 60
-        onset_title = font.render("Onset Detectors", True, (200, 200, 200))
-        screen.blit(onset_title, (20, title_y))
-
-        # Draw onset detectors in two columns
-        detector_y = title_y + 30
-        detector_height = 25
-        col_width = WIDTH // 2
-
-        # Define column layout
-        left_col = [
-            # "energy",
-            "complex",
-            "specflux",
-            "wphase",
-        ]
-        right_col = ["hfc", "phase", "mkl", "kl"]
+            screen.blit(box_surface(blink_color, (20, 20)), (90, 17))
 
-        # Draw left column detectors
-        for i, key in enumerate(left_col):
-            y_pos = detector_y + i * detector_height
-            onset_detectors[key].render(
-                screen, small_font, 40, y_pos, col_width - 80, current_time
-            )
+            # Draw filled portion based on volume (0-1 directly maps to 0-200px)
+            if filled_width > 0:
+                screen.blit(
+                    volume_bar_full,
+                    (volume_bar_x, volume_bar_y),
+                    (0, 0, filled_width, volume_bar_height),
+                )
 
-        # Draw right column detectors
-        for i, key in enumerate(right_col):
-            y_pos = detector_y + i * detector_height
-            onset_detectors[key].render(
-                screen, small_font, col_width + 40, y_pos, col_width - 80, current_time
-            )
+            # Draw both columns of detectors
+            for detector, x_pos, y_pos in detector_layout:
+                detector.render(screen, x_pos, y_pos, col_width - 80, current_time)
 
-        # Draw note visualizer in the bottom part of the screen
-        note_viz_y = (
-            detector_y + max(len(left_col), len(right_col)) * detector_height + 20
-        )
-        note_viz.render(screen, font, 40, note_viz_y, WIDTH - 80, 200)
+            # Draw note visualizer in the bottom part of the screen
+            note_viz.render(screen, 40, note_viz_y, WIDTH - 80, current_time)
 
-        # Draw pitch visualizer below the note visualizer
-        pitch_viz_y = note_viz_y + 100
-        pitch_viz.render(screen, font, 40, pitch_viz_y, WIDTH - 80, current_time)
+            # Draw pitch visualizer below the note visualizer
+            pitch_viz.render(screen, 40, pitch_viz_y, WIDTH - 80, current_time)
 
-        # Display MQTT connection status
-        status_text = "Connected" if latest_data else "No MQTT data"
-        status_color = (100, 255, 100) if latest_data else (255, 100, 100)
-        status_display = small_font.render(status_text, True, status_color)
-        screen.blit(status_display, (20, HEIGHT - 30))
+            # Display MQTT connection status
+            status_text = "Connected" if latest_data else "No MQTT data"
+            status_color = (100, 255, 100) if latest_data else (255, 100, 100)
+            status_display = render_cached(small_font, status_text, status_color)
+            screen.blit(status_display, (20, HEIGHT - 30))
 
-        # Update the display
-        pygame.display.flip()
+            # Push just the changed regions to the display
+            pygame.display.update(dirty_rects)
 
         # Cap the frame rate
         clock.tick(FPS)
 
+        # While no pitches are fading, sleep until the next blink, the next
+        # box going dark or a new MQTT message instead of waking every frame
+        if not pitch_viz.active_pitches:
+            next_change = next_transition_time
+            for detector, _, _ in detector_layout:
+                if detector.is_active(current_time):
+                    next_change = min(
+                        next_change, detector.active_time + detector.active_duration
+                    )
+            note_change = note_viz.next_change(current_time)
+            if note_change is not None:
+                next_change = min(next_change, note_change)
+
+            timeout = int(next_change - pygame.time.get_ticks())
+            if timeout > 0:
+                # Put back whatever ended the wait for the event loop above
+                event = pygame.event.wait(timeout)
+                if event.type != pygame.NOEVENT:
+                    pygame.event.post(event)
+
     # Clean up
     try:
         client.loop_stop()